@@ -0,0 +1,53 @@
+"""
+Password verification throughput (logins/s) of the hashing process pool
+for a range of pool sizes, next to the former approach of running Argon2
+in the AnyIO threadpool that every sync endpoint shares.
+
+Usage (from backend/):
+    python -m benchmarks.login_benchmark --logins 200 --sizes 1 2 4 8
+
+Each size gets its own fresh pool and a burst of concurrent logins. Pool
+sizes above the machine's core count show where throughput flattens.
+"""
+import os
+import time
+import asyncio
+import argparse
+
+# Admit the whole burst; the benchmark measures throughput, not shedding
+os.environ.setdefault("HASH_QUEUE_LIMIT", "1000000")
+
+from starlette.concurrency import run_in_threadpool
+from src import hashing, utils
+
+async def burst(verify, stored: str, logins: int) -> float:
+    started = time.perf_counter()
+    results = await asyncio.gather(*(verify("correct horse", stored) for _ in range(logins)))
+    elapsed = time.perf_counter() - started
+    assert all(ok for ok, _ in results)
+    return logins / elapsed
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    stored = utils.hash_password("correct horse")
+    print(f"cores: {os.cpu_count()}, logins per run: {args.logins}")
+    print(f"{'pool':>6} {'logins/s':>10}")
+    for size in args.sizes:
+        hashing.HASH_POOL_SIZE = size
+        hashing.shutdown()
+        # Start the workers outside the timed burst
+        await hashing.hash_password("warm-up")
+        print(f"{size:>6} {await burst(hashing.verify_and_update, stored, args.logins):>10.1f}")
+    hashing.shutdown()
+
+    threadpool = await burst(
+        lambda pw, h: run_in_threadpool(utils.verify_and_update_password, pw, h), stored, args.logins
+    )
+    print(f"{'thread':>6} {threadpool:>10.1f}  (shared AnyIO threadpool, for reference)")
+
+if __name__ == "__main__":
+    asyncio.run(main())
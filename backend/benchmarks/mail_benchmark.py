@@ -0,0 +1,142 @@
+"""
+Booking email throughput (messages/s) of the pooled mail transport against
+the former path of one event loop, FastMail instance and SMTP connection
+per task, both sending to a local aiosmtpd server.
+
+Usage (from backend/, with `pip install aiosmtpd`):
+    python -m benchmarks.mail_benchmark --tasks 200 --concurrency 4 --sizes 1 2 4
+
+Each task sends what a booking sends: the confirmation with a PDF boarding
+pass and the admin notification. Tasks run on `--concurrency` threads, like
+a Celery worker with that many slots. The local server has no TLS or AUTH,
+so the legacy numbers are an upper bound: against a real provider every one
+of its connections also pays a TLS handshake and a login round trip.
+After the runs the server is restarted under the pool to check that dead
+connections are replaced without losing a message.
+"""
+import os
+import time
+import socket
+import asyncio
+import argparse
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    from aiosmtpd.controller import Controller
+except ImportError:
+    raise SystemExit("This benchmark needs aiosmtpd: pip install aiosmtpd")
+
+from fastapi_mail import ConnectionConfig, FastMail, MessageSchema, MessageType
+from src import boarding_pass, mail_transport
+
+class CountingHandler:
+    def __init__(self):
+        self.received = 0
+
+    async def handle_DATA(self, server, session, envelope):
+        self.received += 1
+        return "250 Message accepted for delivery"
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def local_config(port: int) -> ConnectionConfig:
+    return ConnectionConfig(
+        MAIL_USERNAME="", MAIL_PASSWORD="", MAIL_FROM="bench@example.com", MAIL_FROM_NAME="ABC Travels Support",
+        MAIL_SERVER="127.0.0.1", MAIL_PORT=port,
+        MAIL_STARTTLS=False, MAIL_SSL_TLS=False, USE_CREDENTIALS=False, VALIDATE_CERTS=False
+    )
+
+def sample_pdf() -> bytes:
+    trip = SimpleNamespace(source="Chennai", destination="Madurai", departure_time=datetime(2026, 1, 1, 21, 30))
+    return boarding_pass.render(SimpleNamespace(booking_number="BENCH00001", seat_numbers=[11, 12], trip=trip))
+
+def legacy_task(config: ConnectionConfig, pdf: bytes):
+    """What send_booking_email_sync used to do per task."""
+    async def send():
+        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as f:
+            f.write(pdf)
+        try:
+            fm = FastMail(config)
+            await fm.send_message(MessageSchema(
+                subject="Trip Confirmation", recipients=["user@example.com"], body="<p>Booked</p>",
+                subtype=MessageType.html, attachments=[f.name]
+            ))
+            await fm.send_message(MessageSchema(
+                subject="NEW BOOKING", recipients=["admin@example.com"], body="<p>New booking</p>",
+                subtype=MessageType.html
+            ))
+        finally:
+            os.remove(f.name)
+
+    loop = asyncio.new_event_loop()
+    try:
+        loop.run_until_complete(send())
+    finally:
+        loop.close()
+
+def pooled_task(transport: mail_transport.MailTransport, config: ConnectionConfig, pdf: bytes):
+    transport.send(
+        mail_transport.build_message("Trip Confirmation", ["user@example.com"], "<p>Booked</p>",
+                                     [("BENCH00001.pdf", pdf, "application/pdf")], config),
+        mail_transport.build_message("NEW BOOKING", ["admin@example.com"], "<p>New booking</p>", config=config),
+    )
+
+def run(task, tasks: int, concurrency: int) -> float:
+    started = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as executor:
+        for future in [executor.submit(task) for _ in range(tasks)]:
+            future.result()
+    return tasks * 2 / (time.perf_counter() - started)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tasks", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1, 2, 4])
+    args = parser.parse_args()
+
+    handler = CountingHandler()
+    port = free_port()
+    controller = Controller(handler, hostname="127.0.0.1", port=port)
+    controller.start()
+    config = local_config(port)
+    pdf = sample_pdf()
+
+    print(f"tasks: {args.tasks} (2 messages each), concurrency: {args.concurrency}, pdf: {len(pdf)} bytes")
+    print(f"{'transport':>10} {'msgs/s':>10}")
+    legacy = run(lambda: legacy_task(config, pdf), args.tasks, args.concurrency)
+    print(f"{'legacy':>10} {legacy:>10.1f}")
+
+    for size in args.sizes:
+        transport = mail_transport.MailTransport(config, size)
+        try:
+            # Open the pool's connections outside the timed run
+            run(lambda: pooled_task(transport, config, pdf), size, size)
+            rate = run(lambda: pooled_task(transport, config, pdf), args.tasks, args.concurrency)
+            print(f"{'pool ' + str(size):>10} {rate:>10.1f}  ({rate / legacy:.1f}x)")
+        finally:
+            transport.close()
+
+    # Restart the server under a warm pool: every pooled connection is now dead
+    transport = mail_transport.MailTransport(config, max(args.sizes))
+    try:
+        run(lambda: pooled_task(transport, config, pdf), 4, 4)
+        controller.stop()
+        controller = Controller(handler, hostname="127.0.0.1", port=port)
+        controller.start()
+        before = handler.received
+        run(lambda: pooled_task(transport, config, pdf), 10, 4)
+        assert handler.received - before == 20, handler.received - before
+        print("reconnect after server restart: ok (20/20 delivered)")
+    finally:
+        transport.close()
+        controller.stop()
+
+if __name__ == "__main__":
+    main()
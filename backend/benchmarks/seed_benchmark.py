@@ -0,0 +1,106 @@
+"""
+Schedule seeding benchmark: the bulk `seed_frame` against the former
+row-by-row ORM loop, on data/abctravels_schedule.xlsx scaled up by
+repeating the sheet with a distinct set of buses per copy.
+
+Usage (from backend/):
+    python -m benchmarks.seed_benchmark --scale 1 10 50
+
+Each run starts from an empty schema. By default that is a throwaway SQLite
+file; set BENCH_DATABASE_URL to measure against a real Postgres (its tables
+are dropped and recreated).
+"""
+import os
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+
+_tmp = os.path.join(tempfile.mkdtemp(), "seed_bench.db")
+DATABASE_URL = os.getenv("BENCH_DATABASE_URL", f"sqlite:///{_tmp}")
+# src.database builds its engines at import time
+os.environ.setdefault("DATABASE_URL", DATABASE_URL)
+
+import pandas as pd
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src import models, seed
+from src.database import Base
+
+SCHEDULE = os.path.join(os.path.dirname(seed.__file__), "data", "abctravels_schedule.xlsx")
+
+def scaled_schedule(df: pd.DataFrame, scale: int) -> pd.DataFrame:
+    copies = []
+    for k in range(scale):
+        copy = df.copy()
+        copy["Bus Name"] = copy["Bus Name"] + f" #{k}"
+        copies.append(copy)
+    return pd.concat(copies, ignore_index=True)
+
+def legacy_seed(df: pd.DataFrame, db):
+    """The previous implementation: one bus lookup, flush and ORM add per row."""
+    df.columns = df.columns.str.strip()
+    start_date = seed.seed_start_date(db)
+    # Random numbers collide at this scale; sequential ones keep the baseline running
+    numbers = iter(f"TN 39 X {n:05d}" for n in range(len(df)))
+    # The sheet lists some departures twice; uq_trips_bus_departure rejects
+    # the repeats, so skip them like the bulk path's upsert does
+    seen = set()
+    for _, row in df.iterrows():
+        day_str = str(row['Day']).strip()
+        if day_str not in seed.DAY_INDEX:
+            continue
+        bus = db.query(models.Bus).filter(models.Bus.bus_name == row['Bus Name']).first()
+        if not bus:
+            bus = models.Bus(bus_name=row['Bus Name'], bus_number=next(numbers),
+                             bus_type=row['Bus Type'], total_seats=40)
+            db.add(bus)
+            db.flush()
+        target_date = start_date + timedelta(days=seed.DAY_INDEX[day_str])
+        dep_dt = datetime.combine(target_date, datetime.strptime(str(row['Departure Time']).strip(), "%I:%M %p").time())
+        arr_dt = datetime.combine(target_date, datetime.strptime(str(row['Arrival Time']).strip(), "%I:%M %p").time())
+        if arr_dt <= dep_dt:
+            arr_dt += timedelta(days=1)
+        if (bus.id, dep_dt) in seen:
+            continue
+        seen.add((bus.id, dep_dt))
+        db.add(models.Trip(bus_id=bus.id, source=row['Source'], destination=row['Destination'],
+                           departure_time=dep_dt, arrival_time=arr_dt, price=row['Fare (INR)'],
+                           available_seats=bus.total_seats, booked_seats=0))
+    db.commit()
+
+def run(engine, fn, df) -> float:
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine)()
+    try:
+        started = time.perf_counter()
+        fn(df.copy(), db)
+        return time.perf_counter() - started
+    finally:
+        db.close()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 10, 50])
+    parser.add_argument("--skip-legacy", action="store_true", help="Only time the bulk path")
+    args = parser.parse_args()
+
+    # Unique bus numbers are random; keep runs comparable
+    random.seed(0)
+    engine = create_engine(DATABASE_URL)
+    base = pd.read_excel(SCHEDULE)
+    print(f"database: {engine.url.render_as_string(hide_password=True)}")
+    print(f"{'rows':>8} {'legacy s':>10} {'bulk s':>10} {'speedup':>8} {'bulk rows/s':>12}")
+    for scale in args.scale:
+        df = scaled_schedule(base, scale)
+        bulk = run(engine, seed.seed_frame, df)
+        legacy = None if args.skip_legacy else run(engine, legacy_seed, df)
+        print(
+            f"{len(df):>8} {legacy if legacy is not None else float('nan'):>10.3f} {bulk:>10.3f} "
+            f"{(legacy / bulk) if legacy else float('nan'):>7.1f}x {len(df) / bulk:>12.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""
+Boarding pass throughput (tickets/s per core): the former ReportLab path,
+which redrew the whole page and embedded a freshly encoded QR PNG, against
+the template renderer with and without a warm QR cache, and against a hit
+in the on-disk pass cache.
+
+Usage (from backend/):
+    python -m benchmarks.ticket_benchmark --tickets 500 --processes 1 2 4
+
+Every ticket has its own PNR, so "cold" pays the full QR encoding. "Warm
+QR" re-renders passes whose QR is cached, as happens when a trip's time
+changes. With several processes each runs the same workload on its own
+core; the per-core figure divides the total by the cores actually used.
+"""
+import io
+import os
+import time
+import argparse
+import tempfile
+from datetime import datetime
+from types import SimpleNamespace
+from multiprocessing import Pool
+
+import qrcode
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A6
+from reportlab.lib import colors
+from reportlab.lib.utils import ImageReader
+from src import boarding_pass
+
+def sample_group(i: int):
+    trip = SimpleNamespace(source="Chennai", destination="Madurai", departure_time=datetime(2026, 1, 1, 21, 30))
+    return SimpleNamespace(booking_number=f"ABC-{i:06X}", seat_numbers=[11, 12], trip=trip)
+
+def legacy_render(group) -> bytes:
+    """The previous generate_pdf, trimmed to what it drew."""
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A6)
+    width, height = A6
+    c.setFillColor(colors.black)
+    c.rect(0, height - 60, width, 60, fill=1)
+    c.setFont("Helvetica-Bold", 16)
+    c.setFillColor(colors.white)
+    c.drawString(20, height - 35, "ABC")
+    c.setFillColor(colors.red)
+    c.drawString(58, height - 35, "TRAVELS")
+    c.setStrokeColor(colors.lightgrey)
+    c.setLineWidth(1)
+    c.line(20, height - 80, width - 20, height - 80)
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(20, height - 110, "BOARDING PASS")
+    y_pos = height - 140
+    for label, value in zip(boarding_pass.LABELS, boarding_pass.ticket_fields(group)):
+        c.setFont("Helvetica-Bold", 8)
+        c.setFillColor(colors.red)
+        c.drawString(20, y_pos, label)
+        c.setFont("Helvetica", 11)
+        c.setFillColor(colors.black)
+        c.drawString(20, y_pos - 15, value)
+        y_pos -= 45
+    qr = qrcode.QRCode(version=1, box_size=10, border=2)
+    qr.add_data(group.booking_number)
+    qr.make(fit=True)
+    png = io.BytesIO()
+    qr.make_image(fill_color="black", back_color="white").save(png, format="PNG")
+    png.seek(0)
+    c.drawImage(ImageReader(png), width - 80, 70, width=60, height=60)
+    c.setDash(1, 2)
+    c.line(20, 60, width - 20, 60)
+    c.setDash()
+    c.setFont("Helvetica-Oblique", 8)
+    c.setFillColor(colors.grey)
+    c.drawCentredString(width / 2, 40, "Safe Journey with ABC Travels")
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+def _cache_hit(group) -> bytes:
+    return boarding_pass._read_disk(boarding_pass.fingerprint(group))
+
+def measure(mode: str, tickets: int) -> float:
+    """Tickets/s of one mode in this process."""
+    groups = [sample_group(os.getpid() * 1_000_000 + i) for i in range(tickets)]
+    render = boarding_pass.render
+    if mode == "legacy":
+        render = legacy_render
+    elif mode == "cold":
+        boarding_pass.qr_modules.cache_clear()
+    elif mode == "warm QR":
+        for g in groups:
+            boarding_pass.qr_modules(g.booking_number)
+    elif mode == "cache hit":
+        boarding_pass.TICKET_CACHE_DIR = tempfile.mkdtemp()
+        for g in groups:
+            boarding_pass._write_disk(boarding_pass.fingerprint(g), b"%PDF")
+        render = _cache_hit
+    started = time.perf_counter()
+    for g in groups:
+        render(g)
+    return tickets / (time.perf_counter() - started)
+
+def _measure(args):
+    return measure(*args)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--tickets", type=int, default=500, help="Tickets per process")
+    parser.add_argument("--processes", type=int, nargs="+", default=[1])
+    args = parser.parse_args()
+
+    sample = sample_group(0)
+    print(f"cores: {os.cpu_count()}, tickets per process: {args.tickets}")
+    print(f"pdf bytes: legacy {len(legacy_render(sample))}, template {len(boarding_pass.render(sample))}")
+    print(f"{'mode':>10} {'procs':>6} {'tickets/s':>10} {'per core':>9}")
+    for mode in ("legacy", "cold", "warm QR", "cache hit"):
+        for processes in args.processes:
+            with Pool(processes) as pool:
+                rates = pool.map(_measure, [(mode, args.tickets)] * processes)
+            cores = min(processes, os.cpu_count() or 1)
+            print(f"{mode:>10} {processes:>6} {sum(rates):>10.1f} {sum(rates) / cores:>9.1f}")
+
+if __name__ == "__main__":
+    main()
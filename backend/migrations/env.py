@@ -0,0 +1,45 @@
+from logging.config import fileConfig
+from alembic import context
+from src.database import engine
+from src import models
+
+# Set up Python logging from alembic.ini
+config = context.config
+if config.config_file_name is not None:
+    fileConfig(config.config_file_name)
+
+# Autogenerate compares migrations against the SQLAlchemy models
+target_metadata = models.Base.metadata
+
+def run_migrations_offline():
+    """
+    Emits the migration SQL to stdout (`alembic upgrade head --sql`)
+    instead of running it against a live database.
+    """
+    context.configure(
+        url=engine.url.render_as_string(hide_password=False),
+        target_metadata=target_metadata,
+        literal_binds=True,
+        dialect_opts={"paramstyle": "named"},
+    )
+    with context.begin_transaction():
+        context.run_migrations()
+
+def run_migrations_online():
+    """
+    Runs the migrations on the application's own engine (DATABASE_URL).
+    SQLite needs batch mode to alter existing tables.
+    """
+    with engine.connect() as connection:
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            render_as_batch=connection.dialect.name == "sqlite",
+        )
+        with context.begin_transaction():
+            context.run_migrations()
+
+if context.is_offline_mode():
+    run_migrations_offline()
+else:
+    run_migrations_online()
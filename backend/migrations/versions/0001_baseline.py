@@ -0,0 +1,87 @@
+"""Baseline schema
+
+The tables exactly as `create_all` used to build them. Databases created
+by that older startup path already have this schema: run
+`alembic stamp 0001` on them once instead of upgrading through this
+revision.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("username", sa.String(), nullable=False),
+        sa.Column("email", sa.String(), nullable=False),
+        sa.Column("password", sa.String(), nullable=False),
+        sa.Column("gender", sa.String(), nullable=True),
+        sa.Column("age", sa.Integer(), nullable=True),
+        sa.Column("phone_number", sa.String(), nullable=True),
+        sa.Column("is_admin", sa.Boolean(), nullable=True),
+    )
+    op.create_index("ix_users_id", "users", ["id"])
+    op.create_index("ix_users_username", "users", ["username"])
+    op.create_index("ix_users_email", "users", ["email"], unique=True)
+
+    op.create_table(
+        "buses",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("bus_name", sa.String(), nullable=True, unique=True),
+        sa.Column("bus_number", sa.String(), nullable=True, unique=True),
+        sa.Column("bus_type", sa.String(), nullable=True),
+        sa.Column("total_seats", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_buses_id", "buses", ["id"])
+
+    op.create_table(
+        "trips",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("bus_id", sa.Integer(), sa.ForeignKey("buses.id"), nullable=True),
+        sa.Column("source", sa.String(), nullable=True),
+        sa.Column("destination", sa.String(), nullable=True),
+        sa.Column("departure_time", sa.DateTime(), nullable=True),
+        sa.Column("arrival_time", sa.DateTime(), nullable=True),
+        sa.Column("price", sa.Integer(), nullable=True),
+    )
+    op.create_index("ix_trips_id", "trips", ["id"])
+
+    op.create_table(
+        "seats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("trip_id", sa.Integer(), sa.ForeignKey("trips.id"), nullable=True),
+        sa.Column("seat_number", sa.Integer(), nullable=True),
+        sa.Column("is_booked", sa.Boolean(), nullable=True),
+        sa.Column("is_locked", sa.Boolean(), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_seats_id", "seats", ["id"])
+
+    op.create_table(
+        "bookings",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("booking_number", sa.String(), nullable=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=True),
+        sa.Column("trip_id", sa.Integer(), sa.ForeignKey("trips.id"), nullable=True),
+        sa.Column("seat_id", sa.Integer(), sa.ForeignKey("seats.id"), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_bookings_id", "bookings", ["id"])
+    op.create_index("ix_bookings_booking_number", "bookings", ["booking_number"])
+
+def downgrade():
+    op.drop_table("bookings")
+    op.drop_table("seats")
+    op.drop_table("trips")
+    op.drop_table("buses")
+    op.drop_table("users")
@@ -0,0 +1,29 @@
+"""Per-trip available seat counter
+
+Adds `trips.available_seats` and fills it with the bus's seat count minus
+the trip's booked seats, so existing trips don't report 0 free seats.
+
+Revision ID: 0001a
+Revises: 0001
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001a"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("trips", sa.Column("available_seats", sa.Integer(), nullable=False, server_default="0"))
+    op.execute("""
+        UPDATE trips SET available_seats = COALESCE(
+            (SELECT buses.total_seats FROM buses WHERE buses.id = trips.bus_id), 40
+        ) - (
+            SELECT COUNT(*) FROM seats WHERE seats.trip_id = trips.id AND seats.is_booked
+        )
+    """)
+
+def downgrade():
+    op.drop_column("trips", "available_seats")
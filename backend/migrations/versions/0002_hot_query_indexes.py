@@ -0,0 +1,33 @@
+"""Indexes for the hot queries
+
+* trips: lower(source), lower(destination), departure_time for trip search
+* seats: unique (trip_id, seat_number) for the seat map and booking lookups
+* bookings: (user_id, created_at) for a user's ticket history
+
+Revision ID: 0002
+Revises: 0001a
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001a"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_index(
+        "ix_trips_route_departure",
+        "trips",
+        [sa.text("lower(source)"), sa.text("lower(destination)"), "departure_time"],
+    )
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.create_unique_constraint("uq_seats_trip_seat_number", ["trip_id", "seat_number"])
+    op.create_index("ix_bookings_user_created", "bookings", ["user_id", "created_at"])
+
+def downgrade():
+    op.drop_index("ix_bookings_user_created", table_name="bookings")
+    with op.batch_alter_table("seats") as batch_op:
+        batch_op.drop_constraint("uq_seats_trip_seat_number", type_="unique")
+    op.drop_index("ix_trips_route_departure", table_name="trips")
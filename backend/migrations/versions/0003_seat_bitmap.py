@@ -0,0 +1,87 @@
+"""Replace seat rows with a per-trip booked-seat bitmap
+
+Moves the booked state of every `seats` row into `trips.booked_seats`
+(seat n is bit n - 1) and the seat reference of every booking into
+`bookings.seat_number`, then drops the `seats` table.
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-17
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.add_column("trips", sa.Column("booked_seats", sa.BigInteger(), nullable=False, server_default="0"))
+    op.add_column("bookings", sa.Column("seat_number", sa.Integer(), nullable=True))
+
+    # Distinct bits, so their sum is the OR of the booked seats
+    op.execute("""
+        UPDATE trips SET booked_seats = COALESCE((
+            SELECT SUM(CAST(1 AS BIGINT) << (seats.seat_number - 1))
+            FROM seats
+            WHERE seats.trip_id = trips.id AND seats.is_booked
+        ), 0)
+    """)
+    op.execute("""
+        UPDATE bookings SET seat_number = (
+            SELECT seats.seat_number FROM seats WHERE seats.id = bookings.seat_id
+        )
+    """)
+
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.drop_column("seat_id")
+        batch_op.alter_column("seat_number", existing_type=sa.Integer(), nullable=False)
+
+    op.drop_index("ix_seats_id", table_name="seats")
+    op.drop_table("seats")
+
+def downgrade():
+    op.create_table(
+        "seats",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("trip_id", sa.Integer(), sa.ForeignKey("trips.id"), nullable=True),
+        sa.Column("seat_number", sa.Integer(), nullable=True),
+        sa.Column("is_booked", sa.Boolean(), nullable=True),
+        sa.Column("is_locked", sa.Boolean(), nullable=True),
+        sa.Column("locked_until", sa.DateTime(), nullable=True),
+        sa.UniqueConstraint("trip_id", "seat_number", name="uq_seats_trip_seat_number"),
+    )
+    op.create_index("ix_seats_id", "seats", ["id"])
+
+    # Rebuild one row per seat from each trip's bitmap
+    conn = op.get_bind()
+    seats = sa.table(
+        "seats",
+        sa.column("trip_id", sa.Integer()),
+        sa.column("seat_number", sa.Integer()),
+        sa.column("is_booked", sa.Boolean()),
+        sa.column("is_locked", sa.Boolean()),
+    )
+    trips = conn.execute(sa.text(
+        "SELECT trips.id, trips.booked_seats, COALESCE(buses.total_seats, 40) "
+        "FROM trips LEFT JOIN buses ON buses.id = trips.bus_id"
+    )).all()
+    for trip_id, booked, total_seats in trips:
+        conn.execute(seats.insert(), [
+            {"trip_id": trip_id, "seat_number": n, "is_booked": bool(booked >> (n - 1) & 1), "is_locked": False}
+            for n in range(1, total_seats + 1)
+        ])
+
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.add_column(sa.Column("seat_id", sa.Integer(), nullable=True))
+        batch_op.create_foreign_key("bookings_seat_id_fkey", "seats", ["seat_id"], ["id"])
+    op.execute("""
+        UPDATE bookings SET seat_id = (
+            SELECT seats.id FROM seats
+            WHERE seats.trip_id = bookings.trip_id AND seats.seat_number = bookings.seat_number
+        )
+    """)
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.drop_column("seat_number")
+    op.drop_column("trips", "booked_seats")
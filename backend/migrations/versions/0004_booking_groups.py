@@ -0,0 +1,64 @@
+"""Booking header table keyed by PNR
+
+Adds `booking_groups` (one row per PNR with the fare total) and points every
+seat line in `bookings` at its group. Ticket history now pages over
+`booking_groups(user_id, created_at)`, so the per-seat index goes away.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+def upgrade():
+    op.create_table(
+        "booking_groups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("booking_number", sa.String(), nullable=False, unique=True),
+        sa.Column("user_id", sa.Integer(), sa.ForeignKey("users.id"), nullable=False),
+        sa.Column("trip_id", sa.Integer(), sa.ForeignKey("trips.id"), nullable=False),
+        sa.Column("seat_count", sa.Integer(), nullable=False),
+        sa.Column("total_fare", sa.Integer(), nullable=False),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+    )
+    op.create_index("ix_booking_groups_id", "booking_groups", ["id"])
+    op.create_index("ix_booking_groups_user_created", "booking_groups", ["user_id", "created_at"])
+
+    # One header per existing PNR, priced at the trip's current fare
+    op.execute("""
+        INSERT INTO booking_groups (booking_number, user_id, trip_id, seat_count, total_fare, status, created_at)
+        SELECT bookings.booking_number, MIN(bookings.user_id), MIN(bookings.trip_id), COUNT(*),
+               COUNT(*) * MIN(trips.price), MIN(bookings.status), MIN(bookings.created_at)
+        FROM bookings JOIN trips ON trips.id = bookings.trip_id
+        GROUP BY bookings.booking_number
+    """)
+
+    op.add_column("bookings", sa.Column("group_id", sa.Integer(), nullable=True))
+    op.execute("""
+        UPDATE bookings SET group_id = (
+            SELECT booking_groups.id FROM booking_groups
+            WHERE booking_groups.booking_number = bookings.booking_number
+        )
+    """)
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.alter_column("group_id", existing_type=sa.Integer(), nullable=False)
+        batch_op.create_foreign_key("fk_bookings_group_id", "booking_groups", ["group_id"], ["id"])
+        batch_op.create_index("ix_bookings_group_id", ["group_id"])
+        batch_op.drop_index("ix_bookings_user_created")
+
+def downgrade():
+    with op.batch_alter_table("bookings") as batch_op:
+        batch_op.create_index("ix_bookings_user_created", ["user_id", "created_at"])
+        batch_op.drop_index("ix_bookings_group_id")
+        batch_op.drop_constraint("fk_bookings_group_id", type_="foreignkey")
+        batch_op.drop_column("group_id")
+    op.drop_index("ix_booking_groups_user_created", table_name="booking_groups")
+    op.drop_index("ix_booking_groups_id", table_name="booking_groups")
+    op.drop_table("booking_groups")
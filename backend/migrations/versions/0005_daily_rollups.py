@@ -0,0 +1,61 @@
+"""Daily revenue and occupancy rollups
+
+Adds `daily_rollups`, one row per (day, bus, route) with the capacity and
+bookings of trips departing that day and the sales made that day, and
+fills it from the existing trips and booking headers.
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+def _sale_day() -> str:
+    # The UTC date of a booking, as rollups.sale_day computes it
+    if op.get_context().dialect.name == "postgresql":
+        return "DATE(booking_groups.created_at AT TIME ZONE 'UTC')"
+    return "DATE(booking_groups.created_at)"
+
+def upgrade():
+    op.create_table(
+        "daily_rollups",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("day", sa.Date(), nullable=False),
+        sa.Column("bus_id", sa.Integer(), sa.ForeignKey("buses.id"), nullable=False),
+        sa.Column("source", sa.String(), nullable=False),
+        sa.Column("destination", sa.String(), nullable=False),
+        sa.Column("trips", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("seats_offered", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("seats_booked", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("bookings", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("tickets_sold", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("revenue", sa.Integer(), nullable=False, server_default="0"),
+        sa.UniqueConstraint("day", "bus_id", "source", "destination", name="uq_daily_rollups_day_bus_route"),
+    )
+
+    # Same computation as `python -m src.rollups`, which can redo it at any time
+    op.execute(f"""
+        INSERT INTO daily_rollups (day, bus_id, source, destination, trips, seats_offered, seats_booked, bookings, tickets_sold, revenue)
+        SELECT day, bus_id, source, destination, SUM(trips), SUM(seats_offered), SUM(seats_booked),
+               SUM(bookings), SUM(tickets_sold), SUM(revenue)
+        FROM (
+            SELECT DATE(trips.departure_time) AS day, trips.bus_id, trips.source, trips.destination,
+                   1 AS trips, buses.total_seats AS seats_offered, buses.total_seats - trips.available_seats AS seats_booked,
+                   0 AS bookings, 0 AS tickets_sold, 0 AS revenue
+            FROM trips JOIN buses ON buses.id = trips.bus_id
+            UNION ALL
+            SELECT {_sale_day()}, trips.bus_id, trips.source, trips.destination,
+                   0, 0, 0, 1, booking_groups.seat_count, booking_groups.total_fare
+            FROM booking_groups JOIN trips ON trips.id = booking_groups.trip_id
+        ) AS facts
+        GROUP BY day, bus_id, source, destination
+    """)
+
+def downgrade():
+    op.drop_table("daily_rollups")
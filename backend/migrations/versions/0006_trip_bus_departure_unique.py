@@ -0,0 +1,77 @@
+"""One trip per bus and departure time
+
+Seeding upserts trips on (bus_id, departure_time) so that re-running a
+schedule import never duplicates them. Earlier imports did create such
+duplicates (the bundled schedule lists some departures twice): unbooked
+copies are deleted here and the daily rollups recomputed. Two booked trips
+of one bus at one time cannot be merged automatically and stop the upgrade.
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18
+"""
+from alembic import context, op
+import sqlalchemy as sa
+
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+def _sale_day() -> str:
+    # The UTC date of a booking, as rollups.sale_day computes it
+    if op.get_context().dialect.name == "postgresql":
+        return "DATE(booking_groups.created_at AT TIME ZONE 'UTC')"
+    return "DATE(booking_groups.created_at)"
+
+# Same computation as `python -m src.rollups`; {sale_day} is filled per dialect
+REBUILD_ROLLUPS = """
+    INSERT INTO daily_rollups (day, bus_id, source, destination, trips, seats_offered, seats_booked, bookings, tickets_sold, revenue)
+    SELECT day, bus_id, source, destination, SUM(trips), SUM(seats_offered), SUM(seats_booked),
+           SUM(bookings), SUM(tickets_sold), SUM(revenue)
+    FROM (
+        SELECT DATE(trips.departure_time) AS day, trips.bus_id, trips.source, trips.destination,
+               1 AS trips, buses.total_seats AS seats_offered, buses.total_seats - trips.available_seats AS seats_booked,
+               0 AS bookings, 0 AS tickets_sold, 0 AS revenue
+        FROM trips JOIN buses ON buses.id = trips.bus_id
+        UNION ALL
+        SELECT {sale_day}, trips.bus_id, trips.source, trips.destination,
+               0, 0, 0, 1, booking_groups.seat_count, booking_groups.total_fare
+        FROM booking_groups JOIN trips ON trips.id = booking_groups.trip_id
+    ) AS facts
+    GROUP BY day, bus_id, source, destination
+"""
+
+def upgrade():
+    # Drop every unbooked trip that has a twin which is booked or older, so
+    # one trip per (bus, departure) survives, preferring a booked one
+    op.execute("""
+        DELETE FROM trips
+        WHERE NOT EXISTS (SELECT 1 FROM booking_groups g WHERE g.trip_id = trips.id)
+          AND EXISTS (
+              SELECT 1 FROM trips twin
+              WHERE twin.bus_id = trips.bus_id
+                AND twin.departure_time = trips.departure_time
+                AND twin.id <> trips.id
+                AND (twin.id < trips.id OR EXISTS (SELECT 1 FROM booking_groups g WHERE g.trip_id = twin.id))
+          )
+    """)
+    if not context.is_offline_mode():
+        clash = op.get_bind().execute(sa.text("""
+            SELECT bus_id, departure_time FROM trips
+            GROUP BY bus_id, departure_time HAVING COUNT(*) > 1
+        """)).first()
+        if clash:
+            raise RuntimeError(
+                f"Bus {clash[0]} has several booked trips departing at {clash[1]}; merge them before upgrading"
+            )
+    # The deleted trips no longer count towards the dashboard's capacity
+    op.execute("DELETE FROM daily_rollups")
+    op.execute(REBUILD_ROLLUPS.format(sale_day=_sale_day()))
+
+    # A unique index rather than a constraint: SQLite can add it in place,
+    # without the table rebuild that would drop ix_trips_route_departure
+    op.create_index("uq_trips_bus_departure", "trips", ["bus_id", "departure_time"], unique=True)
+
+def downgrade():
+    op.drop_index("uq_trips_bus_departure", table_name="trips")
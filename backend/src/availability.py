@@ -0,0 +1,35 @@
+from typing import Iterable, Optional
+from sqlalchemy import select, update
+from sqlalchemy.orm import Session
+from . import models
+from .database import SessionLocal
+
+def reconcile_available_seats(db: Session, trip_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rebuilds `Trip.available_seats` from the trip's booked-seat bitmap.
+    The counter is maintained incrementally by bookings (and must be by any
+    future cancellation); this repairs drift, e.g. after manual data fixes or
+    after a schema migration.
+    Returns the number of trips updated.
+    """
+    stmt = select(models.Trip.id, models.Trip.booked_seats, models.Bus.total_seats).join(models.Bus)
+    if trip_ids is not None:
+        stmt = stmt.where(models.Trip.id.in_(list(trip_ids)))
+
+    # Free seats are the bus capacity minus the set bits of the trip's bitmap
+    rows = [
+        {"id": trip_id, "available_seats": total_seats - booked.bit_count()}
+        for trip_id, booked, total_seats in db.execute(stmt)
+    ]
+    if rows:
+        db.execute(update(models.Trip), rows)
+    db.commit()
+    return len(rows)
+
+if __name__ == "__main__":
+    # Usage: python -m src.availability
+    db = SessionLocal()
+    try:
+        print(f"Reconciled availability for {reconcile_available_seats(db)} trips")
+    finally:
+        db.close()
@@ -0,0 +1,218 @@
+import io
+import os
+import time
+import hashlib
+import argparse
+from functools import lru_cache
+from typing import Optional, Tuple
+import qrcode
+from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A6
+from reportlab.lib import colors
+from starlette.concurrency import run_in_threadpool
+from .cache import redis_bytes_client, sync_redis_client
+
+# Bump whenever the layout changes, so every cached pass is rendered again
+TEMPLATE_VERSION = "2"
+# How long a rendered pass stays cached (seconds)
+TICKET_CACHE_TTL = int(os.getenv("TICKET_CACHE_TTL", 7 * 86400))
+# Optional local tier in front of Redis; unset keeps passes in Redis only
+TICKET_CACHE_DIR = os.getenv("TICKET_CACHE_DIR")
+# QR module bitmaps kept per process
+QR_CACHE_SIZE = int(os.getenv("QR_CACHE_SIZE", 4096))
+
+WIDTH, HEIGHT = A6
+LABELS = ("PNR NUMBER", "FROM", "TO", "SEAT(S)", "DEPARTURE")
+QR_X, QR_Y, QR_SIZE = WIDTH - 80, 70, 60
+
+def _draw_static(c: canvas.Canvas):
+    """Everything that is the same on every pass: branding, labels, footer."""
+    # Header Background - Black bar
+    c.setFillColor(colors.black)
+    c.rect(0, HEIGHT - 60, WIDTH, 60, fill=1)
+
+    # Logo Text - ABC TRAVELS branding
+    c.setFont("Helvetica-Bold", 16)
+    c.setFillColor(colors.white)
+    c.drawString(20, HEIGHT - 35, "ABC")
+    c.setFillColor(colors.red)
+    c.drawString(58, HEIGHT - 35, "TRAVELS")
+
+    # Content Separator
+    c.setStrokeColor(colors.lightgrey)
+    c.setLineWidth(1)
+    c.line(20, HEIGHT - 80, WIDTH - 20, HEIGHT - 80)
+
+    c.setFillColor(colors.black)
+    c.setFont("Helvetica-Bold", 12)
+    c.drawString(20, HEIGHT - 110, "BOARDING PASS")
+
+    c.setFont("Helvetica-Bold", 8)
+    c.setFillColor(colors.red)
+    for i, label in enumerate(LABELS):
+        c.drawString(20, HEIGHT - 140 - 45 * i, label)
+
+    # Footer section
+    c.setDash(1, 2)
+    c.line(20, 60, WIDTH - 20, 60)
+    c.setDash()
+
+    c.setFont("Helvetica-Oblique", 8)
+    c.setFillColor(colors.grey)
+    c.drawCentredString(WIDTH / 2, 40, "Safe Journey with ABC Travels")
+
+def ticket_fields(group) -> Tuple[str, ...]:
+    """The values printed on the pass, in LABELS order."""
+    return (
+        f"#{group.booking_number}",
+        group.trip.source.upper(),
+        group.trip.destination.upper(),
+        # Every seat under the PNR is listed on one pass
+        ", ".join(str(n) for n in group.seat_numbers),
+        group.trip.departure_time.strftime('%d %b %Y, %I:%M %p'),
+    )
+
+def fingerprint(group) -> str:
+    """
+    Content address of a pass: a hash of everything drawn on it plus the
+    template version. It changes exactly when a re-render would differ.
+    """
+    digest = hashlib.sha256(TEMPLATE_VERSION.encode())
+    for value in (group.booking_number, *ticket_fields(group)):
+        digest.update(b"\0" + value.encode())
+    return digest.hexdigest()
+
+@lru_cache(maxsize=QR_CACHE_SIZE)
+def qr_modules(data: str) -> Tuple[int, Tuple[Tuple[int, int, int], ...]]:
+    """
+    The QR code for `data` as (modules per side, dark runs), each run being
+    (row, first column, length). Encoding, mask selection included, is the
+    most expensive step of a render, so each PNR is encoded once.
+    """
+    qr = qrcode.QRCode(version=1, border=2)
+    qr.add_data(data)
+    qr.make(fit=True)
+    matrix = qr.get_matrix()  # border included
+    runs = []
+    for row, modules in enumerate(matrix):
+        col = 0
+        while col < len(modules):
+            if modules[col]:
+                start = col
+                while col < len(modules) and modules[col]:
+                    col += 1
+                runs.append((row, start, col - start))
+            else:
+                col += 1
+    return len(matrix), tuple(runs)
+
+def _draw_qr(c: canvas.Canvas, data: str):
+    # Drawn as vector rectangles: no image to encode, sharp at any zoom
+    size, runs = qr_modules(data)
+    module = QR_SIZE / size
+    path = c.beginPath()
+    for row, col, length in runs:
+        path.rect(QR_X + col * module, QR_Y + QR_SIZE - (row + 1) * module, length * module, module)
+    c.setFillColor(colors.black)
+    # One path filled at once, so adjacent modules show no seams
+    c.drawPath(path, stroke=0, fill=1)
+
+def render(group) -> bytes:
+    """
+    Creates the PDF boarding pass for one BookingGroup: the static layout
+    as a form XObject, then the booking's values and its QR code.
+    """
+    buffer = io.BytesIO()
+    c = canvas.Canvas(buffer, pagesize=A6)
+    c.beginForm("static")
+    _draw_static(c)
+    c.endForm()
+    c.doForm("static")
+
+    c.setFont("Helvetica", 11)
+    c.setFillColor(colors.black)
+    for i, value in enumerate(ticket_fields(group)):
+        c.drawString(20, HEIGHT - 155 - 45 * i, value)
+
+    _draw_qr(c, group.booking_number)
+
+    c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+def cache_key(digest: str) -> str:
+    return f"ticket_pdf:{digest}"
+
+def _disk_path(digest: str) -> str:
+    return os.path.join(TICKET_CACHE_DIR, digest[:2], f"{digest}.pdf")
+
+def _read_disk(digest: str) -> Optional[bytes]:
+    try:
+        with open(_disk_path(digest), "rb") as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _write_disk(digest: str, pdf: bytes):
+    path = _disk_path(digest)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Readers never see a partly written file
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(pdf)
+    os.replace(tmp, path)
+
+async def get_pdf(group) -> Tuple[str, bytes]:
+    """
+    (fingerprint, PDF) for a pass, looked up on disk, then in Redis, and
+    rendered (off the event loop) only when neither has this content yet.
+    The booking email renders first, so a download is usually a cache hit.
+    """
+    digest = fingerprint(group)
+    pdf = await run_in_threadpool(_read_disk, digest) if TICKET_CACHE_DIR else None
+    if pdf is None:
+        pdf = await redis_bytes_client.get(cache_key(digest))
+        if pdf is None:
+            pdf = await run_in_threadpool(render, group)
+            await redis_bytes_client.set(cache_key(digest), pdf, ex=TICKET_CACHE_TTL)
+        if TICKET_CACHE_DIR:
+            await run_in_threadpool(_write_disk, digest, pdf)
+    return digest, pdf
+
+def get_pdf_sync(group) -> bytes:
+    """The same lookup for Celery tasks."""
+    digest = fingerprint(group)
+    pdf = _read_disk(digest) if TICKET_CACHE_DIR else None
+    if pdf is None:
+        pdf = sync_redis_client.get(cache_key(digest))
+        if pdf is None:
+            pdf = render(group)
+            sync_redis_client.set(cache_key(digest), pdf, ex=TICKET_CACHE_TTL)
+        if TICKET_CACHE_DIR:
+            _write_disk(digest, pdf)
+    return pdf
+
+def prune_disk(max_age: int = TICKET_CACHE_TTL) -> int:
+    """
+    Removes passes older than `max_age` seconds from TICKET_CACHE_DIR.
+    Superseded versions are never read again, so age alone decides.
+    """
+    if not TICKET_CACHE_DIR or not os.path.isdir(TICKET_CACHE_DIR):
+        return 0
+    cutoff = time.time() - max_age
+    removed = 0
+    for root, _, files in os.walk(TICKET_CACHE_DIR):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.getmtime(path) < cutoff:
+                os.remove(path)
+                removed += 1
+    return removed
+
+if __name__ == "__main__":
+    # Usage: python -m src.boarding_pass --prune
+    parser = argparse.ArgumentParser(description="Maintain the on-disk boarding pass cache")
+    parser.add_argument("--prune", action="store_true", help="Delete passes older than TICKET_CACHE_TTL")
+    args = parser.parse_args()
+    if args.prune:
+        print(f"Removed {prune_disk()} cached passes")
@@ -0,0 +1,68 @@
+import json
+import asyncio
+from typing import Awaitable, Callable
+import redis.asyncio as aioredis
+
+class RedisBroadcast:
+    """
+    Cross-process event bus for seat updates built on Redis Pub/Sub.
+    Events are published to a per-trip channel; each process subscribes only
+    to the trips it currently has viewers for and hands incoming events to its
+    local room through `on_event` as the still-encoded JSON frame.
+    """
+    def __init__(self, client: aioredis.Redis, on_event: Callable[[int, str], Awaitable[None]]):
+        self.client = client
+        self.on_event = on_event
+        # One dedicated Pub/Sub connection per process, checked out of the shared pool
+        self.pubsub = client.pubsub()
+        # Set while at least one channel is subscribed, so the reader can idle otherwise
+        self._has_channels = asyncio.Event()
+
+    @staticmethod
+    def channel(trip_id: int) -> str:
+        """Redis channel carrying the seat events of one trip."""
+        return f"seats:{trip_id}"
+
+    async def publish(self, trip_id: int, message: dict):
+        """
+        Sends an event to every process that has viewers of the trip.
+        The event is encoded exactly once here; that frame is what viewers receive.
+        """
+        await self.client.publish(self.channel(trip_id), json.dumps(message, separators=(",", ":")))
+
+    async def subscribe(self, trip_id: int):
+        """Starts receiving events for a trip (called for its first local viewer)."""
+        await self.pubsub.subscribe(self.channel(trip_id))
+        self._has_channels.set()
+
+    async def unsubscribe(self, trip_id: int):
+        """Stops receiving events for a trip (called when its last local viewer leaves)."""
+        await self.pubsub.unsubscribe(self.channel(trip_id))
+
+    async def run(self):
+        """
+        Background task that reads the subscribed channels and forwards each
+        event to the local room of its trip.
+        """
+        while True:
+            try:
+                if not self.pubsub.subscribed:
+                    # Nothing to read until a viewer connects
+                    self._has_channels.clear()
+                    await self._has_channels.wait()
+
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
+                if message and message["type"] == "message":
+                    # Channel format: 'seats:trip_id'
+                    trip_id = int(message["channel"].split(":")[1])
+                    await self.on_event(trip_id, message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Broadcast Error: {e}")
+                # Wait before retrying to prevent rapid-fire error looping
+                await asyncio.sleep(1)
+
+    async def close(self):
+        """Releases the Pub/Sub connection back to the pool."""
+        await self.pubsub.aclose()
@@ -0,0 +1,19 @@
+import os
+import redis
+import redis.asyncio as aioredis
+
+# Configuration for Redis connection
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Shared asyncio connection pool: every Redis call on the request path goes
+# through it, so a round trip never blocks the event loop
+redis_pool = aioredis.ConnectionPool.from_url(REDIS_URL, decode_responses=True)
+redis_client = aioredis.Redis(connection_pool=redis_pool)
+
+# Same, for binary values (e.g. cached PDFs), which must not be decoded
+redis_bytes_pool = aioredis.ConnectionPool.from_url(REDIS_URL)
+redis_bytes_client = aioredis.Redis(connection_pool=redis_bytes_pool)
+
+# Blocking client for Celery tasks, which run outside any event loop.
+# Responses stay bytes so binary payloads (e.g. uploads) round-trip intact.
+sync_redis_client = redis.from_url(REDIS_URL)
@@ -1,28 +1,76 @@
-import os
-from celery import Celery
-from .mail_utils import send_booking_email_sync
-
-# Configuration for the Redis message broker and result backend
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-
-# Initialize the Celery application
-# 'tasks' is the name of the main module for the worker
-celery_app = Celery(
-    "tasks",
-    broker=REDIS_URL,   # Where tasks are sent (Redis)
-    backend=REDIS_URL   # Where results are stored (Redis)
-)
-
-@celery_app.task(name="send_booking_email_task")
-def send_booking_email_task(email: str, pnr: str):
-    """
-    Background task to handle email dispatch.
-    By offloading this to Celery, the booking API remains fast 
-    and is not delayed by SMTP network latency.
-    """
-    try:
-        # Calls the synchronous wrapper which handles PDF generation and mailing
-        return send_booking_email_sync(email, pnr)
-    except Exception as e:
-        # Return error string so it can be logged in the Celery backend
-        return str(e)
\ No newline at end of file
+import os
+from celery import Celery
+from celery.signals import worker_process_shutdown
+from .mail_utils import send_booking_email_sync
+from .availability import reconcile_available_seats
+from .rollups import rebuild_rollups
+from .seed_jobs import run_job
+from .database import SessionLocal
+from . import mail_transport
+
+# Configuration for the Redis message broker and result backend
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+
+# Initialize the Celery application
+# 'tasks' is the name of the main module for the worker
+celery_app = Celery(
+    "tasks",
+    broker=REDIS_URL,   # Where tasks are sent (Redis)
+    backend=REDIS_URL   # Where results are stored (Redis)
+)
+
+
+@worker_process_shutdown.connect
+def close_mail_transport(**kwargs):
+    # QUIT the pooled SMTP sessions instead of dropping them when a worker exits
+    mail_transport.shutdown()
+
+
+@celery_app.task(name="send_booking_email_task")
+def send_booking_email_task(email: str, pnr: str):
+    """
+    Background task to handle email dispatch.
+    By offloading this to Celery, the booking API remains fast 
+    and is not delayed by SMTP network latency.
+    """
+    try:
+        # Calls the synchronous wrapper which handles PDF generation and mailing
+        return send_booking_email_sync(email, pnr)
+    except Exception as e:
+        # Return error string so it can be logged in the Celery backend
+        return str(e)
+
+
+@celery_app.task(name="reconcile_seat_counters_task")
+def reconcile_seat_counters_task(trip_ids=None):
+    """
+    Rebuilds the per-trip availability counters (`trips.available_seats`)
+    from each trip's `trips.booked_seats` bitmap.
+    Can be triggered on demand or scheduled with Celery beat.
+    """
+    db = SessionLocal()
+    try:
+        return reconcile_available_seats(db, trip_ids)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="rebuild_rollups_task")
+def rebuild_rollups_task():
+    """
+    Recomputes the admin dashboard's daily rollups from trips and bookings.
+    """
+    db = SessionLocal()
+    try:
+        return rebuild_rollups(db)
+    finally:
+        db.close()
+
+
+@celery_app.task(name="seed_schedule_task")
+def seed_schedule_task(job_id: str):
+    """
+    Imports an uploaded schedule sheet in committed chunks.
+    Progress is published to the job hash polled by GET /setup/seed-jobs/{job_id}.
+    """
+    return run_job(job_id)
@@ -0,0 +1,28 @@
+from typing import Optional
+from fastapi import Request, Response
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Whether an If-None-Match header names `etag`: `*`, or a list of tags
+    compared weakly (a `W/` prefix on either side is ignored).
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == opaque for tag in if_none_match.split(","))
+
+def not_modified(request: Request, response: Response, etag: str, cache_control: str = "no-cache") -> bool:
+    """
+    Tags the response with `etag` and reports whether the client's
+    If-None-Match already names it.
+    """
+    response.headers["ETag"] = etag
+    # Let clients keep the body but revalidate it on every use
+    response.headers["Cache-Control"] = cache_control
+    return etag_matches(request.headers.get("if-none-match"), etag)
+
+def response_304(response: Response) -> Response:
+    """A bodiless 304 carrying the headers set on `response`."""
+    return Response(status_code=304, headers=dict(response.headers))
@@ -1,33 +1,75 @@
-import os
-from dotenv import load_dotenv
-from sqlalchemy import create_engine
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-
-# Load environment variables (e.g., DATABASE_URL)
-load_dotenv()
-
-# Retrieve the database connection string from the environment
-SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
-
-# Create the SQLAlchemy engine to manage the connection pool
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-
-# Configure the session factory
-# autocommit/autoflush=False ensures transactions are controlled manually
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Create the base class for all SQLAlchemy models to inherit from
-Base = declarative_base()
-
-def get_db():
-    """
-    Dependency to provide a database session for each request.
-    Ensures the session is automatically closed after the request is finished.
-    """
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        # Closing the session returns the connection to the pool
-        db.close()
\ No newline at end of file
+import os
+from dotenv import load_dotenv
+from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.orm import sessionmaker
+
+# Load environment variables (e.g., DATABASE_URL)
+load_dotenv()
+
+# Retrieve the database connection string from the environment
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL")
+
+def _async_database_url(url: str) -> str:
+    """
+    Maps the synchronous DATABASE_URL onto its asyncio driver.
+    Postgres goes through psycopg 3, which accepts the same libpq query
+    parameters (sslmode, channel_binding) as the sync driver.
+    """
+    parsed = make_url(url)
+    backend = parsed.get_backend_name()
+    if backend == "postgresql":
+        parsed = parsed.set(drivername="postgresql+psycopg")
+    elif backend == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+# An explicit ASYNC_DATABASE_URL wins; otherwise derive it from DATABASE_URL
+SQLALCHEMY_ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_database_url(SQLALCHEMY_DATABASE_URL)
+
+# Create the SQLAlchemy engine to manage the connection pool
+engine = create_engine(SQLALCHEMY_DATABASE_URL)
+
+# Async engine used by the `async def` routes so queries never block the event loop
+async_engine = create_async_engine(SQLALCHEMY_ASYNC_DATABASE_URL, pool_pre_ping=True)
+
+# Configure the session factory
+# autocommit/autoflush=False ensures transactions are controlled manually
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Async session factory; expire_on_commit=False keeps loaded attributes usable
+# after commit without an implicit (and in asyncio, illegal) lazy refresh
+AsyncSessionLocal = async_sessionmaker(async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False)
+
+# Create the base class for all SQLAlchemy models to inherit from
+Base = declarative_base()
+
+def dialect_insert(dialect_name: str):
+    """
+    The INSERT construct of the given backend. Postgres and SQLite share the
+    ON CONFLICT API (on_conflict_do_nothing / on_conflict_do_update).
+    """
+    return postgresql.insert if dialect_name == "postgresql" else sqlite.insert
+
+def get_db():
+    """
+    Dependency to provide a database session for each request.
+    Ensures the session is automatically closed after the request is finished.
+    """
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        # Closing the session returns the connection to the pool
+        db.close()
+
+async def get_async_db():
+    """
+    Async counterpart of `get_db` for `async def` routes.
+    The session is closed (and its connection returned to the pool) after the request.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,119 +1,283 @@
-import os
-import redis
-import asyncio
-import redis.asyncio as aioredis
-from fastapi import WebSocket
-from typing import Dict, List
-
-# Configuration for Redis connection
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-# Synchronous client for standard key-value operations
-redis_client = redis.from_url(REDIS_URL, decode_responses=True)
-
-class ConnectionManager:
-    """
-    Manages active WebSocket connections organized by trip_id.
-    Handles connection lifecycle and message broadcasting.
-    """
-    def __init__(self):
-        # Maps trip_id (int) to a list of active WebSocket objects
-        self.active_connections: Dict[int, List[WebSocket]] = {}
-
-    async def connect(self, trip_id: int, websocket: WebSocket):
-        """
-        Accepts a new connection and synchronizes the initial seat state from Redis.
-        """
-        await websocket.accept()
-        t_id = int(trip_id)
-        
-        # Initialize the trip room if it doesn't exist
-        if t_id not in self.active_connections:
-            self.active_connections[t_id] = []
-        self.active_connections[t_id].append(websocket)
-        
-        # Short pause to ensure connection stability before sync
-        await asyncio.sleep(0.1)
-        
-        try:
-            # Sync existing locks: Query Redis for all keys matching 'lock:trip_id:*'
-            pattern = f"lock:{t_id}:*"
-            keys = redis_client.keys(pattern)
-            
-            current_locks = []
-            for k in keys:
-                # Parse key format: 'lock:trip_id:seat_number'
-                seat_no = int(k.split(":")[-1])
-                owner_id = redis_client.get(k)
-                current_locks.append({
-                    "seat_no": seat_no,
-                    "user_id": int(owner_id) if owner_id else None
-                })
-            
-            # Send the current state of the bus to the newly connected client
-            await websocket.send_json({
-                "type": "INITIAL_STATE",
-                "locked_seats": current_locks
-            })
-        except Exception as e:
-            print(f"Sync Error (Non-fatal): {e}")
-
-    def disconnect(self, trip_id: int, websocket: WebSocket):
-        """
-        Removes a WebSocket connection from the trip room registry.
-        """
-        t_id = int(trip_id)
-        if t_id in self.active_connections:
-            if websocket in self.active_connections[t_id]:
-                self.active_connections[t_id].remove(websocket)
-
-    async def broadcast(self, trip_id: int, message: dict):
-        """
-        Sends a JSON message to all clients currently viewing a specific trip.
-        """
-        t_id = int(trip_id)
-        if t_id in self.active_connections:
-            # Iterate over a copy of the list to prevent errors during removals
-            for connection in self.active_connections[t_id][:]:
-                try:
-                    await connection.send_json(message)
-                except Exception:
-                    # If sending fails, assume stale connection and disconnect
-                    self.disconnect(t_id, connection)
-
-# Global instance of the manager
-manager = ConnectionManager()
-
-async def redis_expiration_listener():
-    """
-    Background task that listens to Redis Keyspace Notifications.
-    When a 'lock' key expires, it broadcasts a 'SEAT_UNLOCKED' event via WebSockets.
-    """
-    # Asynchronous Redis client required for non-blocking Pub/Sub
-    async_redis = aioredis.from_url(REDIS_URL, decode_responses=True)
-    pubsub = async_redis.pubsub()
-    
-    # Subscribe to expiration events in Database 0
-    await pubsub.psubscribe("__keyevent@0__:expired")
-    
-    while True:
-        try:
-            # Check for new messages from Redis with a 1-second timeout
-            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=1.0)
-            if message and message["type"] == "pmessage":
-                expired_key = message["data"]
-                
-                # Logic to handle seat hold timeouts
-                if expired_key.startswith("lock:"):
-                    parts = expired_key.split(":")
-                    t_id = int(parts[1])
-                    s_no = int(parts[2])
-                    
-                    # Notify all clients in the trip room to release the visual lock
-                    await manager.broadcast(t_id, {
-                        "type": "SEAT_UNLOCKED",
-                        "seat_no": s_no
-                    })
-        except Exception as e:
-            print(f"Listener Error: {e}")
-            # Wait before retrying to prevent rapid-fire error looping
-            await asyncio.sleep(5)
\ No newline at end of file
+import os
+import json
+import uuid
+import asyncio
+from fastapi import WebSocket
+from typing import Dict, List, Optional, Union
+from .cache import REDIS_URL, redis_pool, redis_client
+from .broadcast import RedisBroadcast
+from .database import AsyncSessionLocal
+from . import seat_locks, seat_map
+
+# Outbound messages buffered per WebSocket before the slow-consumer policy applies
+WS_SEND_QUEUE_SIZE = int(os.getenv("WS_SEND_QUEUE_SIZE", 64))
+# What to do when a client's queue is full:
+#   'drop_oldest' - discard the oldest queued event to make room
+#   'snapshot'    - discard the backlog and send one fresh seat snapshot instead
+#   'disconnect'  - close the socket; the client reconnects and resyncs
+WS_SLOW_CONSUMER_POLICY = os.getenv("WS_SLOW_CONSUMER_POLICY", "snapshot")
+# Window (ms) for merging a trip's seat events into one SEATS_DELTA frame; 0 disables
+# coalescing and forwards every event as-is (e.g. 50 for flash-sale traffic)
+WS_COALESCE_MS = int(os.getenv("WS_COALESCE_MS", 0))
+# How often the hold-expiry sweeper looks for due holds (seconds)
+HOLD_SWEEP_INTERVAL = float(os.getenv("HOLD_SWEEP_INTERVAL", 0.5))
+# Sweeper leadership lease; if the leader dies another process takes over after it lapses
+SWEEPER_LEASE_MS = 5000
+
+# Queue markers the writer turns into a seat snapshot when it reaches them
+_INITIAL_STATE = object()   # holds only; booked seats come from GET /trips/{id}/seats
+_RESYNC_STATE = object()    # holds plus booked seats, replacing dropped events
+
+class ClientConnection:
+    """
+    A single viewer's WebSocket with its own bounded outbound queue.
+    A dedicated writer task drains the queue, so a slow client only ever
+    delays itself and never the broadcaster.
+    """
+    def __init__(self, trip_id: int, websocket: WebSocket, manager: "ConnectionManager"):
+        self.trip_id = trip_id
+        self.websocket = websocket
+        self.manager = manager
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE_SIZE)
+        self.writer: Optional[asyncio.Task] = None
+
+    def start(self):
+        """Starts the writer task that owns all sends on this socket."""
+        self.writer = asyncio.create_task(self._drain())
+
+    def enqueue(self, item: Union[dict, str, object]) -> bool:
+        """
+        Queues an outbound item without waiting on the network.
+        Returns False when the client should be dropped as a slow consumer.
+        """
+        try:
+            self.queue.put_nowait(item)
+            return True
+        except asyncio.QueueFull:
+            pass
+
+        if WS_SLOW_CONSUMER_POLICY == "disconnect":
+            return False
+        if WS_SLOW_CONSUMER_POLICY == "snapshot":
+            # The whole backlog is superseded by one fresh snapshot
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(_RESYNC_STATE)
+        else:
+            # 'drop_oldest': make room for the newest event
+            self.queue.get_nowait()
+            self.queue.put_nowait(item)
+        return True
+
+    async def _drain(self):
+        """Writer loop: sends queued items in order until the socket fails."""
+        try:
+            while True:
+                item = await self.queue.get()
+                if item is _INITIAL_STATE or item is _RESYNC_STATE:
+                    try:
+                        item = await self.manager.snapshot(self.trip_id, with_booked=item is _RESYNC_STATE)
+                    except Exception as e:
+                        print(f"Sync Error (Non-fatal): {e}")
+                        continue
+                if isinstance(item, str):
+                    await self.websocket.send_text(item)
+                else:
+                    await self.websocket.send_json(item)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            # If sending fails, assume stale connection and disconnect
+            await self.manager.disconnect(self.trip_id, self.websocket)
+
+    def close(self, code: Optional[int] = None):
+        """Stops the writer; with a close code the socket itself is closed too."""
+        if self.writer and self.writer is not asyncio.current_task():
+            self.writer.cancel()
+        if code is not None:
+            asyncio.create_task(self._close_socket(code))
+
+    async def _close_socket(self, code: int):
+        try:
+            await self.websocket.close(code=code)
+        except Exception:
+            pass
+
+class ConnectionManager:
+    """
+    Manages active WebSocket connections organized by trip_id.
+    Handles connection lifecycle and message broadcasting. Broadcasts travel
+    over Redis Pub/Sub so viewers on every worker process receive them, and
+    are delivered through per-connection queues so no send is awaited inline.
+    """
+    def __init__(self):
+        # Maps trip_id (int) to the list of connected clients
+        self.active_connections: Dict[int, List[ClientConnection]] = {}
+        # Cross-process bus; incoming events are delivered to the local room
+        self.bus = RedisBroadcast(redis_client, self.send_local)
+        # Seat changes waiting for the current coalescing window, per trip
+        self.pending_changes: Dict[int, Dict[int, dict]] = {}
+
+    async def connect(self, trip_id: int, websocket: WebSocket) -> ClientConnection:
+        """
+        Accepts a new connection and queues the initial seat state from Redis
+        as the first message the client receives.
+        """
+        await websocket.accept()
+        t_id = int(trip_id)
+        
+        # Initialize the trip room if it doesn't exist and start listening for its events
+        if t_id not in self.active_connections:
+            self.active_connections[t_id] = []
+            await self.bus.subscribe(t_id)
+
+        client = ClientConnection(t_id, websocket, self)
+        self.active_connections[t_id].append(client)
+        client.enqueue(_INITIAL_STATE)
+        client.start()
+        return client
+
+    async def snapshot(self, trip_id: int, with_booked: bool = False) -> dict:
+        """
+        Builds the current state of the bus for one trip. Holds come from the
+        trip's index in Redis: one read that is O(holds on this trip).
+        """
+        current_locks = [
+            {"seat_no": seat_no, "user_id": owner_id}
+            for seat_no, owner_id in await seat_locks.locked_seats(trip_id)
+        ]
+        message = {"type": "INITIAL_STATE", "locked_seats": current_locks}
+        if with_booked:
+            # Booked seats are included when the snapshot replaces dropped events
+            async with AsyncSessionLocal() as db:
+                message["booked_seats"] = await seat_map.booked_seats(db, trip_id)
+        return message
+
+    async def disconnect(self, trip_id: int, websocket: WebSocket, code: Optional[int] = None):
+        """
+        Removes a WebSocket connection from the trip room registry.
+        The trip's channel is dropped once its last local viewer leaves.
+        """
+        t_id = int(trip_id)
+        if t_id in self.active_connections:
+            for client in self.active_connections[t_id][:]:
+                if client.websocket is websocket:
+                    self.active_connections[t_id].remove(client)
+                    client.close(code)
+            if not self.active_connections[t_id]:
+                del self.active_connections[t_id]
+                await self.bus.unsubscribe(t_id)
+
+    async def broadcast(self, trip_id: int, message: dict):
+        """
+        Publishes a JSON message to all clients viewing a specific trip,
+        on this and every other worker process.
+        """
+        try:
+            await self.bus.publish(int(trip_id), message)
+        except Exception as e:
+            # The seat change itself already succeeded; viewers resync on reconnect
+            print(f"Broadcast Error: {e}")
+
+    async def send_local(self, trip_id: int, frame: str):
+        """
+        Delivers an encoded event frame to the clients connected to this process
+        for a trip. The same frame object is queued for every viewer, so nothing
+        is re-encoded per connection. With coalescing on, seat events are merged
+        into one delta frame per window instead.
+        """
+        t_id = int(trip_id)
+        if WS_COALESCE_MS > 0:
+            changes = _seat_changes(json.loads(frame))
+            if changes is not None:
+                self._coalesce(t_id, changes)
+                return
+            # Anything that is not a seat change must not overtake pending changes
+            await self._flush(t_id)
+        await self._enqueue_all(t_id, frame)
+
+    def _coalesce(self, trip_id: int, changes: List[tuple]):
+        """Folds seat changes into the trip's pending window, opening one if needed."""
+        pending = self.pending_changes.get(trip_id)
+        if pending is None:
+            pending = self.pending_changes[trip_id] = {}
+            asyncio.create_task(self._flush_later(trip_id))
+        for seat_no, change in changes:
+            # Last change wins, except that a booking is final
+            if pending.get(seat_no, {}).get("state") != "booked":
+                pending[seat_no] = change
+
+    async def _flush_later(self, trip_id: int):
+        await asyncio.sleep(WS_COALESCE_MS / 1000)
+        await self._flush(trip_id)
+
+    async def _flush(self, trip_id: int):
+        """Encodes the trip's pending changes once and queues them as a SEATS_DELTA frame."""
+        pending = self.pending_changes.pop(trip_id, None)
+        if not pending:
+            return
+        frame = json.dumps({
+            "type": "SEATS_DELTA",
+            "seats": [{"seat_no": seat_no, **change} for seat_no, change in pending.items()]
+        }, separators=(",", ":"))
+        await self._enqueue_all(trip_id, frame)
+
+    async def _enqueue_all(self, trip_id: int, frame: str):
+        """Queues a frame for every local viewer of a trip; never waits on a send."""
+        slow = [
+            client for client in self.active_connections.get(trip_id, [])
+            if not client.enqueue(frame)
+        ]
+        for client in slow:
+            # 1013 (Try Again Later): the client reconnects and gets a fresh snapshot
+            await self.disconnect(trip_id, client.websocket, code=1013)
+
+def _seat_changes(event: dict) -> Optional[List[tuple]]:
+    """
+    Maps a seat event onto (seat_no, {"state": ..., "user_id": ...}) changes,
+    or returns None for events that cannot be coalesced.
+    """
+    kind = event.get("type")
+    if kind in ("SEAT_LOCKED", "SEAT_UNLOCKED"):
+        seats = [event["seat_no"]]
+    elif kind in ("SEATS_LOCKED", "SEATS_UNLOCKED", "SEAT_BOOKED"):
+        seats = event["seat_numbers"]
+    else:
+        return None
+
+    if kind == "SEAT_BOOKED":
+        return [(int(n), {"state": "booked"}) for n in seats]
+    state = "unlocked" if "UNLOCKED" in kind else "locked"
+    return [(int(n), {"state": state, "user_id": event.get("user_id")}) for n in seats]
+
+# Global instance of the manager
+manager = ConnectionManager()
+
+async def hold_expiry_sweeper():
+    """
+    Background task that releases seat holds once their deadline passes.
+    Every process runs it, but only the holder of the sweeper lease pops due
+    holds from the schedule, so each expiry is broadcast exactly once.
+    """
+    token = uuid.uuid4().hex
+    
+    while True:
+        try:
+            if await seat_locks.acquire_sweeper_lease(token, SWEEPER_LEASE_MS):
+                while True:
+                    expired = await seat_locks.sweep_expired()
+                    for t_id, seats in expired.items():
+                        for s_no in seats:
+                            # Notify all clients in the trip room to release the visual lock
+                            await manager.broadcast(t_id, {
+                                "type": "SEAT_UNLOCKED",
+                                "seat_no": s_no
+                            })
+                    # A full batch means more holds may already be due
+                    if sum(len(seats) for seats in expired.values()) < seat_locks.HOLD_SWEEP_BATCH:
+                        break
+            await asyncio.sleep(HOLD_SWEEP_INTERVAL)
+        except Exception as e:
+            print(f"Sweeper Error: {e}")
+            # Wait before retrying to prevent rapid-fire error looping
+            await asyncio.sleep(5)
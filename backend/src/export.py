@@ -0,0 +1,147 @@
+import os
+import sys
+import csv
+import io
+import json
+import zlib
+import argparse
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Iterable, Iterator, Optional
+from sqlalchemy import func, select
+from . import models
+from .database import SessionLocal
+
+# Rows fetched per round trip from the server-side cursor; memory stays bounded by this
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", 1000))
+
+# One exported row per booked seat, in this column order
+COLUMNS = (
+    "booking_number", "seat_number", "status", "booked_at", "fare",
+    "user_id", "username", "email", "phone_number",
+    "trip_id", "source", "destination", "departure_time", "arrival_time",
+    "bus_id", "bus_name", "bus_number", "bus_type",
+)
+
+def export_query(
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    by: str = "booked",
+    source: Optional[str] = None,
+    destination: Optional[str] = None
+):
+    """
+    Seat lines joined with their PNR header, trip, bus and user.
+    The date range is inclusive and applies to the booking date (its UTC
+    date, as in the dashboard rollups), or to the departure date when `by`
+    is "departure". Cities match case-insensitively.
+    """
+    Booking, Group, Trip, Bus, User = models.Booking, models.BookingGroup, models.Trip, models.Bus, models.User
+    stmt = (
+        select(
+            Booking.booking_number, Booking.seat_number, Booking.status,
+            Booking.created_at.label("booked_at"),
+            # Every seat of a PNR is sold at the same fare
+            (Group.total_fare // Group.seat_count).label("fare"),
+            User.id.label("user_id"), User.username, User.email, User.phone_number,
+            Trip.id.label("trip_id"), Trip.source, Trip.destination, Trip.departure_time, Trip.arrival_time,
+            Bus.id.label("bus_id"), Bus.bus_name, Bus.bus_number, Bus.bus_type,
+        )
+        .join(Group, Booking.group_id == Group.id)
+        .join(Trip, Booking.trip_id == Trip.id)
+        .join(Bus, Trip.bus_id == Bus.id)
+        .join(User, Booking.user_id == User.id)
+        # Stable order, so two exports of the same range line up
+        .order_by(Booking.id)
+    )
+    if by == "departure":
+        # Departures are naive wall-clock times, compared as they are
+        column, tz = Trip.departure_time, None
+    else:
+        # Sales count on their UTC date everywhere (see rollups.sale_day)
+        column, tz = Booking.created_at, timezone.utc
+    if date_from:
+        stmt = stmt.where(column >= datetime.combine(date_from, time.min, tzinfo=tz))
+    if date_to:
+        stmt = stmt.where(column < datetime.combine(date_to + timedelta(days=1), time.min, tzinfo=tz))
+    if source:
+        stmt = stmt.where(func.lower(Trip.source) == source.strip().lower())
+    if destination:
+        stmt = stmt.where(func.lower(Trip.destination) == destination.strip().lower())
+    return stmt
+
+def iter_batches(stmt) -> Iterator[list]:
+    """
+    Runs `stmt` on its own session through a server-side cursor and yields
+    the rows in batches of EXPORT_BATCH_SIZE. The session lives exactly as
+    long as the iteration, so it can back a streaming response.
+    """
+    db = SessionLocal()
+    try:
+        # yield_per turns on stream_results: a named cursor on Postgres
+        result = db.execute(stmt, execution_options={"yield_per": EXPORT_BATCH_SIZE})
+        for batch in result.partitions():
+            yield batch
+    finally:
+        db.close()
+
+def _value(v):
+    return v.isoformat() if isinstance(v, (datetime, date)) else v
+
+def to_csv(batches: Iterable[list]) -> Iterator[bytes]:
+    """Header line, then one encoded chunk per batch of rows."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(COLUMNS)
+    yield buffer.getvalue().encode()
+    for batch in batches:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows([_value(v) for v in row] for row in batch)
+        yield buffer.getvalue().encode()
+
+def to_ndjson(batches: Iterable[list]) -> Iterator[bytes]:
+    """One JSON object per line, one encoded chunk per batch of rows."""
+    for batch in batches:
+        yield "".join(
+            json.dumps(dict(zip(COLUMNS, map(_value, row)))) + "\n" for row in batch
+        ).encode()
+
+FORMATS = {
+    "csv": (to_csv, "text/csv"),
+    "ndjson": (to_ndjson, "application/x-ndjson"),
+}
+
+def gzip_chunks(chunks: Iterable[bytes]) -> Iterator[bytes]:
+    """Compresses a byte stream on the fly into a single gzip member."""
+    compressor = zlib.compressobj(wbits=31)  # 31 = gzip header and trailer
+    for chunk in chunks:
+        out = compressor.compress(chunk)
+        if out:
+            yield out
+    yield compressor.flush()
+
+if __name__ == "__main__":
+    # Usage: python -m src.export --format csv --from 2026-01-01 --to 2026-01-31 -o bookings.csv
+    parser = argparse.ArgumentParser(description="Stream bookings as CSV or NDJSON")
+    parser.add_argument("--format", choices=FORMATS, default="csv")
+    parser.add_argument("--from", dest="date_from", type=date.fromisoformat)
+    parser.add_argument("--to", dest="date_to", type=date.fromisoformat)
+    parser.add_argument("--by", choices=("booked", "departure"), default="booked")
+    parser.add_argument("--source")
+    parser.add_argument("--destination")
+    parser.add_argument("--gzip", action="store_true")
+    parser.add_argument("-o", "--output", help="Output file (default: stdout)")
+    args = parser.parse_args()
+
+    encode, _ = FORMATS[args.format]
+    chunks = encode(iter_batches(export_query(args.date_from, args.date_to, args.by, args.source, args.destination)))
+    if args.gzip:
+        chunks = gzip_chunks(chunks)
+
+    out = open(args.output, "wb") if args.output else sys.stdout.buffer
+    try:
+        for chunk in chunks:
+            out.write(chunk)
+    finally:
+        if args.output:
+            out.close()
@@ -0,0 +1,74 @@
+import os
+import asyncio
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Optional, Tuple
+from fastapi import HTTPException, status
+from . import utils
+
+# Worker processes hashing passwords; Argon2 is CPU-bound, so one per core
+HASH_POOL_SIZE = int(os.getenv("HASH_POOL_SIZE", os.cpu_count() or 1))
+# Hashes running or waiting at once; beyond this requests get 503 immediately
+HASH_QUEUE_LIMIT = int(os.getenv("HASH_QUEUE_LIMIT", HASH_POOL_SIZE * 4))
+# Retry-After sent with that 503 (seconds)
+HASH_RETRY_AFTER = os.getenv("HASH_RETRY_AFTER", "1")
+
+logger = logging.getLogger(__name__)
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pending = 0
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    if _pool is None:
+        # spawn: forking a process that runs an event loop and threads is unsafe
+        _pool = ProcessPoolExecutor(HASH_POOL_SIZE, mp_context=multiprocessing.get_context("spawn"))
+    return _pool
+
+async def _run(fn, *args):
+    """
+    Runs one hashing call in the pool, or rejects it with 503 when
+    HASH_QUEUE_LIMIT calls are already in flight. Keeping the backlog short
+    bounds login latency under a burst instead of letting it grow unbounded.
+    """
+    global _pool, _pending
+    if _pending >= HASH_QUEUE_LIMIT:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many sign-in attempts in progress, please retry",
+            headers={"Retry-After": HASH_RETRY_AFTER}
+        )
+    _pending += 1
+    pool = _get_pool()
+    try:
+        return await asyncio.get_running_loop().run_in_executor(pool, fn, *args)
+    except BrokenProcessPool:
+        # A worker died (OOM kill, segfault) and the executor never recovers;
+        # drop it so the next call starts a fresh pool. Calls that were in
+        # flight on it all land here, but only the first replaces it
+        if _pool is pool:
+            logger.error("Password hashing pool broke, starting a new one")
+            pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Sign-in is temporarily unavailable, please retry",
+            headers={"Retry-After": HASH_RETRY_AFTER}
+        )
+    finally:
+        _pending -= 1
+
+async def hash_password(password: str) -> str:
+    return await _run(utils.hash_password, password)
+
+async def verify_and_update(password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+    """(matches, replacement hash or None); see utils.verify_and_update_password."""
+    return await _run(utils.verify_and_update_password, password, hashed_password)
+
+def shutdown():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
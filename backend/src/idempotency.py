@@ -0,0 +1,86 @@
+import os
+import json
+import uuid
+import hashlib
+from typing import Any, Optional
+from fastapi import HTTPException
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from .cache import redis_client
+
+# How long a finished response is replayed for a repeated key (seconds)
+IDEMPOTENCY_TTL_SECONDS = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", 86400))
+# How long an in-flight marker blocks duplicates if its request never finishes
+IDEMPOTENCY_PENDING_SECONDS = int(os.getenv("IDEMPOTENCY_PENDING_SECONDS", 60))
+# Longest accepted Idempotency-Key header
+MAX_KEY_LENGTH = 255
+
+# Drops an in-flight marker only if it still belongs to the given request.
+# KEYS[1] idempotency key; ARGV[1] request token
+ABANDON_LUA = """
+local raw = redis.call('GET', KEYS[1])
+if raw and cjson.decode(raw)['token'] == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_abandon_script = redis_client.register_script(ABANDON_LUA)
+
+class IdempotentRequest:
+    """
+    Tracks one request carrying an `Idempotency-Key` header.
+    Redis holds either an in-flight marker or the final response under
+    `idem:{scope}:{key}`, together with a hash of the request body so a key
+    cannot be reused for a different request.
+    """
+
+    def __init__(self, scope: str, key: str, payload: Any):
+        if not key or len(key) > MAX_KEY_LENGTH:
+            raise HTTPException(status_code=400, detail="Invalid Idempotency-Key")
+        self.redis_key = f"idem:{scope}:{key}"
+        self.fingerprint = hashlib.sha256(
+            json.dumps(jsonable_encoder(payload), sort_keys=True).encode()
+        ).hexdigest()
+        self.token = uuid.uuid4().hex
+        self.completed = False
+
+    async def start(self) -> Optional[JSONResponse]:
+        """
+        Claims the key for this request and returns None, or returns the
+        stored response of an earlier request with the same key.
+        """
+        marker = json.dumps({"state": "pending", "token": self.token, "fingerprint": self.fingerprint})
+        if await redis_client.set(self.redis_key, marker, nx=True, ex=IDEMPOTENCY_PENDING_SECONDS):
+            return None
+
+        raw = await redis_client.get(self.redis_key)
+        if raw is None:
+            # The earlier attempt was abandoned in between; take over
+            return await self.start()
+        entry = json.loads(raw)
+        if entry["fingerprint"] != self.fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+        if entry["state"] == "pending":
+            raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress")
+        return JSONResponse(
+            status_code=entry["status_code"],
+            content=entry["body"],
+            headers={"Idempotent-Replayed": "true"}
+        )
+
+    async def complete(self, status_code: int, body: Any):
+        """Stores the final response; repeats of the key replay it from now on."""
+        entry = json.dumps({
+            "state": "done",
+            "fingerprint": self.fingerprint,
+            "status_code": status_code,
+            "body": jsonable_encoder(body)
+        })
+        await redis_client.set(self.redis_key, entry, ex=IDEMPOTENCY_TTL_SECONDS)
+        self.completed = True
+
+    async def abandon(self):
+        """Frees the key after a failed attempt so a retry runs again."""
+        if not self.completed:
+            await _abandon_script(keys=[self.redis_key], args=[self.token])
@@ -0,0 +1,175 @@
+import os
+import asyncio
+import threading
+from email.message import EmailMessage
+from email.utils import formataddr, formatdate, make_msgid
+from typing import Iterable, List, Optional, Tuple
+import aiosmtplib
+from fastapi_mail import ConnectionConfig
+from .mail_config import conf
+
+# Authenticated SMTP connections kept open per worker process
+MAIL_POOL_SIZE = int(os.getenv("MAIL_POOL_SIZE", 2))
+# Connections idle for longer than this are probed with NOOP before reuse (seconds)
+MAIL_IDLE_CHECK_SECONDS = int(os.getenv("MAIL_IDLE_CHECK_SECONDS", 30))
+# How long a synchronous caller waits for its messages to go out (seconds)
+MAIL_SEND_TIMEOUT = int(os.getenv("MAIL_SEND_TIMEOUT", 120))
+
+# The server went away under a pooled connection; a fresh one is worth one more try
+_RECONNECT_ERRORS = (aiosmtplib.SMTPServerDisconnected, aiosmtplib.SMTPConnectError, ConnectionError)
+
+# (filename, content, MIME type), sent straight from memory
+Attachment = Tuple[str, bytes, str]
+
+def build_message(
+    subject: str,
+    recipients: List[str],
+    html: str,
+    attachments: Iterable[Attachment] = (),
+    config: ConnectionConfig = conf
+) -> EmailMessage:
+    msg = EmailMessage()
+    msg["From"] = formataddr((config.MAIL_FROM_NAME, config.MAIL_FROM))
+    msg["To"] = ", ".join(recipients)
+    msg["Subject"] = subject
+    msg["Date"] = formatdate(localtime=True)
+    msg["Message-ID"] = make_msgid()
+    msg.set_content(html, subtype="html")
+    for filename, content, mime_type in attachments:
+        maintype, subtype = mime_type.split("/", 1)
+        msg.add_attachment(content, maintype=maintype, subtype=subtype, filename=filename)
+    return msg
+
+class SMTPPool:
+    """
+    Up to `size` logged-in SMTP connections shared by every message sent on
+    one event loop. A connection is opened (TLS handshake and AUTH) only when
+    none is idle, and handed back after each message instead of closed.
+    """
+    def __init__(self, config: ConnectionConfig = conf, size: int = MAIL_POOL_SIZE):
+        self.config = config
+        self.size = size
+        self._slots = asyncio.Semaphore(size)
+        # (connection, loop time it was last used); the most recent is reused first
+        self._idle: List[Tuple[aiosmtplib.SMTP, float]] = []
+
+    async def _connect(self) -> aiosmtplib.SMTP:
+        c = self.config
+        smtp = aiosmtplib.SMTP(
+            hostname=c.MAIL_SERVER,
+            port=c.MAIL_PORT,
+            use_tls=c.MAIL_SSL_TLS,
+            start_tls=c.MAIL_STARTTLS,
+            validate_certs=c.VALIDATE_CERTS,
+            timeout=c.TIMEOUT
+        )
+        await smtp.connect()
+        if c.USE_CREDENTIALS:
+            await smtp.login(c.MAIL_USERNAME, c.MAIL_PASSWORD.get_secret_value())
+        return smtp
+
+    async def _checkout(self) -> aiosmtplib.SMTP:
+        now = asyncio.get_running_loop().time()
+        while self._idle:
+            smtp, last_used = self._idle.pop()
+            if not smtp.is_connected:
+                continue
+            if now - last_used > MAIL_IDLE_CHECK_SECONDS:
+                # Servers drop idle sessions; find out now rather than mid-message
+                try:
+                    await smtp.noop()
+                except (aiosmtplib.SMTPException, OSError):
+                    self._discard(smtp)
+                    continue
+            return smtp
+        return await self._connect()
+
+    def _discard(self, smtp: aiosmtplib.SMTP):
+        if smtp.is_connected:
+            smtp.close()
+
+    async def send(self, message: EmailMessage):
+        if self.config.SUPPRESS_SEND:
+            return
+        async with self._slots:
+            smtp = await self._checkout()
+            try:
+                await smtp.send_message(message)
+            except _RECONNECT_ERRORS:
+                self._discard(smtp)
+                smtp = await self._connect()
+                try:
+                    await smtp.send_message(message)
+                except BaseException:
+                    self._discard(smtp)
+                    raise
+            except BaseException:
+                # Unknown session state; don't hand it to the next message
+                self._discard(smtp)
+                raise
+            self._idle.append((smtp, asyncio.get_running_loop().time()))
+
+    async def close(self):
+        idle, self._idle = self._idle, []
+        for smtp, _ in idle:
+            try:
+                await smtp.quit()
+            except (aiosmtplib.SMTPException, OSError):
+                self._discard(smtp)
+
+class MailTransport:
+    """
+    A long-lived event loop on a background thread that owns an SMTPPool.
+    Synchronous code (Celery tasks) hands messages to it and waits, so
+    connections outlive a single task and no loop is created per send.
+    """
+    def __init__(self, config: ConnectionConfig = conf, size: int = MAIL_POOL_SIZE):
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="mail-transport", daemon=True)
+        self._thread.start()
+        self.pool = SMTPPool(config, size)
+
+    async def _send_all(self, messages: List[EmailMessage]):
+        await asyncio.gather(*(self.pool.send(m) for m in messages))
+
+    def send(self, *messages: EmailMessage):
+        """Sends the messages concurrently over pooled connections; raises the first failure."""
+        future = asyncio.run_coroutine_threadsafe(self._send_all(list(messages)), self.loop)
+        future.result(timeout=MAIL_SEND_TIMEOUT)
+
+    async def send_async(self, *messages: EmailMessage):
+        """The same, awaitable from another event loop (e.g. a FastAPI route)."""
+        await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(self._send_all(list(messages)), self.loop))
+
+    def close(self):
+        try:
+            asyncio.run_coroutine_threadsafe(self.pool.close(), self.loop).result(timeout=10)
+        finally:
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join(timeout=10)
+            self.loop.close()
+
+_transport: Optional[MailTransport] = None
+_transport_pid: Optional[int] = None
+_lock = threading.Lock()
+
+def get_transport() -> MailTransport:
+    """
+    This process's transport, created on first use. Celery's prefork workers
+    are forked from the parent, and the parent's loop thread does not survive
+    a fork, so a child always builds its own.
+    """
+    global _transport, _transport_pid
+    with _lock:
+        if _transport is None or _transport_pid != os.getpid():
+            _transport = MailTransport()
+            _transport_pid = os.getpid()
+        return _transport
+
+def shutdown():
+    global _transport, _transport_pid
+    with _lock:
+        if _transport is not None and _transport_pid == os.getpid():
+            _transport.close()
+        _transport = None
+        _transport_pid = None
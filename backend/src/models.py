@@ -1,82 +1,137 @@
-from sqlalchemy import Column, Integer, String, Boolean, ForeignKey, DateTime
-from sqlalchemy.orm import relationship
-from .database import Base
-from datetime import datetime
-from sqlalchemy.sql import func
-
-class User(Base):
-    """
-    Represents the system users, including both customers and administrators.
-    """
-    __tablename__ = "users"
-
-    id = Column(Integer, primary_key=True, index=True)
-    username = Column(String, index=True, nullable=False)
-    email = Column(String, unique=True, index=True, nullable=False)
-    password = Column(String, nullable=False)
-    gender = Column(String, nullable=True)
-    age = Column(Integer, nullable=True)
-    phone_number = Column(String, nullable=True)
-    is_admin = Column(Boolean, default=False)  # Determines access to administrative routes
-
-class Bus(Base):
-    """
-    Defines the physical bus assets available in the fleet.
-    """
-    __tablename__ = "buses"
-    id = Column(Integer, primary_key=True, index=True)
-    bus_name = Column(String, unique=True)
-    bus_number = Column(String, unique=True)
-    bus_type = Column(String)  # e.g., AC, Non-AC, Sleeper
-    total_seats = Column(Integer, default=40)
-
-class Trip(Base):
-    """
-    Represents a specific journey scheduled for a Bus from source to destination.
-    """
-    __tablename__ = "trips"
-
-    id = Column(Integer, primary_key=True, index=True)
-    bus_id = Column(Integer, ForeignKey("buses.id"))
-    source = Column(String)
-    destination = Column(String)
-    departure_time = Column(DateTime)
-    arrival_time = Column(DateTime)
-    price = Column(Integer)
-    
-    # Relationships
-    bus = relationship("Bus")
-    seats = relationship("Seat", back_populates="trip")
-
-class Seat(Base):
-    """
-    Tracks the availability and locking status of individual seats for a specific Trip.
-    Used for real-time seat selection and temporary locks.
-    """
-    __tablename__ = "seats"
-    id = Column(Integer, primary_key=True, index=True)
-    trip_id = Column(Integer, ForeignKey("trips.id"))
-    seat_number = Column(Integer)
-    is_booked = Column(Boolean, default=False)  # Persistent booking status
-    is_locked = Column(Boolean, default=False)  # Temporary status for selection phase
-    locked_until = Column(DateTime, nullable=True) # Expiration timestamp for the temporary lock
-
-    trip = relationship("Trip", back_populates="seats")
-
-class Booking(Base):
-    """
-    Stores the final transaction details linking a User to a specific Seat on a Trip.
-    """
-    __tablename__ = "bookings"
-    id = Column(Integer, primary_key=True, index=True)
-    booking_number = Column(String, index=True) # Unique reference for the ticket
-    user_id = Column(Integer, ForeignKey("users.id"))
-    trip_id = Column(Integer, ForeignKey("trips.id"))
-    seat_id = Column(Integer, ForeignKey("seats.id"))
-    status = Column(String, default="confirmed") # e.g., confirmed, cancelled
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    
-    # Relationships to access associated data objects
-    user = relationship("User")
-    trip = relationship("Trip")
-    seat = relationship("Seat")
\ No newline at end of file
+from sqlalchemy import Column, Integer, BigInteger, String, Boolean, ForeignKey, Date, DateTime, Index, UniqueConstraint
+from sqlalchemy.orm import relationship
+from .database import Base
+from datetime import datetime
+from sqlalchemy.sql import func
+
+class User(Base):
+    """
+    Represents the system users, including both customers and administrators.
+    """
+    __tablename__ = "users"
+
+    id = Column(Integer, primary_key=True, index=True)
+    username = Column(String, index=True, nullable=False)
+    email = Column(String, unique=True, index=True, nullable=False)
+    password = Column(String, nullable=False)
+    gender = Column(String, nullable=True)
+    age = Column(Integer, nullable=True)
+    phone_number = Column(String, nullable=True)
+    is_admin = Column(Boolean, default=False)  # Determines access to administrative routes
+
+class Bus(Base):
+    """
+    Defines the physical bus assets available in the fleet.
+    """
+    __tablename__ = "buses"
+    id = Column(Integer, primary_key=True, index=True)
+    bus_name = Column(String, unique=True)
+    bus_number = Column(String, unique=True)
+    bus_type = Column(String)  # e.g., AC, Non-AC, Sleeper
+    total_seats = Column(Integer, default=40)
+
+class Trip(Base):
+    """
+    Represents a specific journey scheduled for a Bus from source to destination.
+    """
+    __tablename__ = "trips"
+    __table_args__ = (
+        # A bus departs at most once at a given time; seeding upserts on this
+        Index("uq_trips_bus_departure", "bus_id", "departure_time", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    bus_id = Column(Integer, ForeignKey("buses.id"))
+    source = Column(String)
+    destination = Column(String)
+    departure_time = Column(DateTime)
+    arrival_time = Column(DateTime)
+    price = Column(Integer)
+    # Denormalized count of unbooked seats, kept in step with `booked_seats` by
+    # every booking so search never has to count seats (see availability.py).
+    # Migration 0001a adds it and backfills existing trips
+    available_seats = Column(Integer, nullable=False, default=0, server_default="0")
+    # Bitmap of booked seats: seat n is bit (n - 1). Bookings set bits with one
+    # conditional UPDATE and Redis keeps a mirror of it (see seat_map.py)
+    booked_seats = Column(BigInteger, nullable=False, default=0, server_default="0")
+    
+    # Relationships
+    bus = relationship("Bus")
+
+# Trip search matches cities case-insensitively within a departure window
+Index(
+    "ix_trips_route_departure",
+    func.lower(Trip.source), func.lower(Trip.destination), Trip.departure_time
+)
+
+class BookingGroup(Base):
+    """
+    One reservation (PNR): the header shared by every seat booked together,
+    with the fare snapshot taken at booking time. Seat lines are `Booking` rows.
+    """
+    __tablename__ = "booking_groups"
+    __table_args__ = (
+        # A user's ticket history, newest first
+        Index("ix_booking_groups_user_created", "user_id", "created_at"),
+    )
+    id = Column(Integer, primary_key=True, index=True)
+    booking_number = Column(String, unique=True, nullable=False) # PNR shown on the ticket
+    user_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    trip_id = Column(Integer, ForeignKey("trips.id"), nullable=False)
+    seat_count = Column(Integer, nullable=False)
+    total_fare = Column(Integer, nullable=False)
+    status = Column(String, default="confirmed") # e.g., confirmed, cancelled
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    user = relationship("User")
+    trip = relationship("Trip")
+    seats = relationship("Booking", back_populates="group", order_by="Booking.seat_number")
+
+    @property
+    def seat_numbers(self):
+        return [line.seat_number for line in self.seats]
+
+class Booking(Base):
+    """
+    One seat line of a BookingGroup, linking a User to a specific seat on a Trip.
+    """
+    __tablename__ = "bookings"
+    id = Column(Integer, primary_key=True, index=True)
+    group_id = Column(Integer, ForeignKey("booking_groups.id"), nullable=False, index=True)
+    booking_number = Column(String, index=True) # PNR of the owning group
+    user_id = Column(Integer, ForeignKey("users.id"))
+    trip_id = Column(Integer, ForeignKey("trips.id"))
+    seat_number = Column(Integer, nullable=False)
+    status = Column(String, default="confirmed") # e.g., confirmed, cancelled
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    
+    # Relationships to access associated data objects
+    group = relationship("BookingGroup", back_populates="seats")
+    user = relationship("User")
+    trip = relationship("Trip")
+
+class DailyRollup(Base):
+    """
+    Per-day, per-bus, per-route totals behind the admin dashboard, kept up to
+    date by bookings and seeding (see rollups.py). Two kinds of fact share a
+    row: trips and seats departing on `day`, and sales made on `day`.
+    """
+    __tablename__ = "daily_rollups"
+    __table_args__ = (
+        UniqueConstraint("day", "bus_id", "source", "destination", name="uq_daily_rollups_day_bus_route"),
+    )
+    id = Column(Integer, primary_key=True)
+    day = Column(Date, nullable=False)
+    bus_id = Column(Integer, ForeignKey("buses.id"), nullable=False)
+    source = Column(String, nullable=False)
+    destination = Column(String, nullable=False)
+    # Trips departing on `day`: their number, capacity and seats booked on them
+    trips = Column(Integer, nullable=False, default=0, server_default="0")
+    seats_offered = Column(Integer, nullable=False, default=0, server_default="0")
+    seats_booked = Column(Integer, nullable=False, default=0, server_default="0")
+    # Sales made on `day`: PNRs, seats and fare collected
+    bookings = Column(Integer, nullable=False, default=0, server_default="0")
+    tickets_sold = Column(Integer, nullable=False, default=0, server_default="0")
+    revenue = Column(Integer, nullable=False, default=0, server_default="0")
+
+    bus = relationship("Bus")
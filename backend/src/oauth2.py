@@ -1,49 +1,76 @@
-from jose import JWTError, jwt
-from datetime import datetime
-from fastapi import Depends, status, HTTPException
-from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
-from . import database, models
-from dotenv import load_dotenv
-import os
-
-# Initialize environment variables
-load_dotenv()
-
-# Define the OAuth2 scheme; the tokenUrl points to the login route
-oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/login')
-
-# Security configuration retrieved from environment variables
-SECRET_KEY = os.getenv("SECRET_KEY", "382048920492489302935745")
-ALGORITHM = "HS256"
-
-def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)):
-    """
-    Dependency function to validate the JWT token and return the current user.
-    Used to protect routes that require authentication.
-    """
-    # Standard exception for authentication failures
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
-
-    try:
-        # Decode the JWT token using the secret key and defined algorithm
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: str = payload.get("id")
-        
-        # Ensure the user ID exists within the token payload
-        if user_id is None:
-            raise credentials_exception
-    except JWTError:
-        # Raised if the token is expired, tampered with, or invalid
-        raise credentials_exception
-        
-    # Query the database to ensure the user still exists
-    user = db.query(models.User).filter(models.User.id == user_id).first()
-    if user is None:
-        raise credentials_exception
-        
-    return user
\ No newline at end of file
+from jose import JWTError, jwt
+from datetime import datetime
+from fastapi import Depends, status, HTTPException
+from fastapi.security import OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import database, models, principals, schemas
+from dotenv import load_dotenv
+import os
+
+# Initialize environment variables
+load_dotenv()
+
+# Define the OAuth2 scheme; the tokenUrl points to the login route
+oauth2_scheme = OAuth2PasswordBearer(tokenUrl='auth/login')
+
+# Security configuration retrieved from environment variables
+SECRET_KEY = os.getenv("SECRET_KEY", "382048920492489302935745")
+ALGORITHM = "HS256"
+
+async def get_current_principal(token: str = Depends(oauth2_scheme)) -> schemas.Principal:
+    """
+    Dependency function to validate the JWT token and return the current
+    user's principal (id, is_admin, profile fields) from the principal cache.
+    Needs no database session unless the cache misses; use it for routes
+    that only have to know who is calling.
+    """
+    # Standard exception for authentication failures
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Could not validate credentials",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+
+    try:
+        # Decode the JWT token using the secret key and defined algorithm
+        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        user_id: str = payload.get("id")
+        
+        # Ensure the user ID exists within the token payload
+        if user_id is None:
+            raise credentials_exception
+    except JWTError:
+        # Raised if the token is expired, tampered with, or invalid
+        raise credentials_exception
+        
+    # Ensure the user still exists (answered from cache when possible)
+    principal = await principals.get_principal(int(user_id))
+    if principal is None:
+        raise credentials_exception
+        
+    return principal
+
+async def get_current_user(
+    principal: schemas.Principal = Depends(get_current_principal),
+    db: AsyncSession = Depends(database.get_async_db)
+):
+    """
+    Dependency function returning the current user as an ORM object bound to
+    the request's session, for routes that modify the user row.
+    """
+    user = await db.get(models.User, principal.id)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Could not validate credentials",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return user
+
+async def get_current_admin(principal: schemas.Principal = Depends(get_current_principal)):
+    """
+    Dependency for administrative routes: the current user must be an admin.
+    """
+    if not principal.is_admin:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return principal
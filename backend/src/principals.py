@@ -0,0 +1,81 @@
+import os
+import time
+import argparse
+import asyncio
+from collections import OrderedDict
+from typing import Optional
+from .cache import redis_client
+from .database import AsyncSessionLocal
+from . import models, schemas
+
+# Seconds a principal is served from this process's memory without asking Redis.
+# Kept short: it is how long another process may act on a changed user.
+PRINCIPAL_LOCAL_TTL = float(os.getenv("PRINCIPAL_LOCAL_TTL", 5))
+# Principals held in memory per process (least recently used are evicted)
+PRINCIPAL_LOCAL_SIZE = int(os.getenv("PRINCIPAL_LOCAL_SIZE", 4096))
+# Seconds a principal lives in Redis before it is reloaded from the database
+PRINCIPAL_CACHE_TTL = int(os.getenv("PRINCIPAL_CACHE_TTL", 300))
+
+# user id -> (expires at, principal), in least-recently-used order
+_local: "OrderedDict[int, tuple]" = OrderedDict()
+
+def principal_key(user_id: int) -> str:
+    return f"principal:{user_id}"
+
+def _remember(principal: schemas.Principal):
+    _local[principal.id] = (time.monotonic() + PRINCIPAL_LOCAL_TTL, principal)
+    _local.move_to_end(principal.id)
+    while len(_local) > PRINCIPAL_LOCAL_SIZE:
+        _local.popitem(last=False)
+
+async def get_principal(user_id: int) -> Optional[schemas.Principal]:
+    """
+    Resolves a user id to its principal: process memory first, then Redis,
+    then the users table. Returns None when the user does not exist.
+    """
+    entry = _local.get(user_id)
+    if entry and entry[0] > time.monotonic():
+        _local.move_to_end(user_id)
+        return entry[1]
+
+    raw = await redis_client.get(principal_key(user_id))
+    if raw is not None:
+        principal = schemas.Principal.model_validate_json(raw)
+    else:
+        async with AsyncSessionLocal() as db:
+            user = await db.get(models.User, user_id)
+        if user is None:
+            return None
+        principal = schemas.Principal.model_validate(user)
+        # NX: a concurrent `refresh` with newer data must not be overwritten
+        await redis_client.set(principal_key(user_id), principal.model_dump_json(), ex=PRINCIPAL_CACHE_TTL, nx=True)
+    _remember(principal)
+    return principal
+
+async def refresh(user: models.User):
+    """Replaces a user's cached principal with its just-committed row."""
+    principal = schemas.Principal.model_validate(user)
+    await redis_client.set(principal_key(user.id), principal.model_dump_json(), ex=PRINCIPAL_CACHE_TTL)
+    _remember(principal)
+
+async def invalidate(user_id: int):
+    """
+    Forgets a user's cached principal after its row changed (profile fields,
+    admin status). Other processes drop theirs within PRINCIPAL_LOCAL_TTL.
+    """
+    _local.pop(user_id, None)
+    await redis_client.delete(principal_key(user_id))
+
+if __name__ == "__main__":
+    # Usage: python -m src.principals 42 43   (after editing users by hand, e.g. is_admin)
+    parser = argparse.ArgumentParser(description="Drop cached principals of the given users")
+    parser.add_argument("user_ids", type=int, nargs="+")
+    args = parser.parse_args()
+
+    async def main():
+        for user_id in args.user_ids:
+            await invalidate(user_id)
+        await redis_client.aclose()
+
+    asyncio.run(main())
+    print(f"Invalidated {len(args.user_ids)} cached principals")
@@ -0,0 +1,114 @@
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Iterable
+from sqlalchemy import delete, func, insert, literal, select, union_all
+from sqlalchemy.orm import Session
+from . import models
+from .database import SessionLocal, dialect_insert
+
+# Columns that are added up when a change lands on an existing rollup row
+MEASURES = ("trips", "seats_offered", "seats_booked", "bookings", "tickets_sold", "revenue")
+
+def increment_stmt(dialect_name: str):
+    """
+    Upsert that adds its parameter rows onto their (day, bus, route) rows.
+    Execute it with `merge_deltas(...)` as the parameters.
+    """
+    stmt = dialect_insert(dialect_name)(models.DailyRollup)
+    return stmt.on_conflict_do_update(
+        index_elements=["day", "bus_id", "source", "destination"],
+        set_={m: getattr(models.DailyRollup, m) + getattr(stmt.excluded, m) for m in MEASURES}
+    )
+
+def merge_deltas(deltas: Iterable[dict]) -> list:
+    """
+    Parameter rows for `increment_stmt`. Each delta names its row key plus
+    any subset of MEASURES; deltas for the same row are merged, since one
+    statement may touch a row only once. Rows come out in key order so
+    concurrent writers lock them in the same order.
+    """
+    merged = defaultdict(lambda: dict.fromkeys(MEASURES, 0))
+    for d in deltas:
+        row = merged[(d["day"], d["bus_id"], d["source"], d["destination"])]
+        for m in MEASURES:
+            row[m] += d.get(m, 0)
+    return [
+        {"day": day, "bus_id": bus_id, "source": source, "destination": destination, **row}
+        for (day, bus_id, source, destination), row in sorted(merged.items())
+    ]
+
+def sale_day(dialect_name: str):
+    """
+    SQL for the day a booking was sold on: the UTC calendar date of its
+    `created_at`, whatever the server's or the session's time zone.
+    `booking_deltas` uses the same rule, so a rebuild reproduces live totals.
+    """
+    if dialect_name == "postgresql":
+        # timestamptz -> UTC wall clock, then its date
+        return func.date(func.timezone("UTC", models.BookingGroup.created_at))
+    # SQLite stores timestamps as UTC text already
+    return func.date(models.BookingGroup.created_at)
+
+def booking_deltas(trip: models.Trip, seat_count: int, fare: int, booked_at: datetime) -> list:
+    """
+    A booking sells seats on the UTC date of `booked_at` and fills seats on
+    the trip's departure day.
+    """
+    route = {"bus_id": trip.bus_id, "source": trip.source, "destination": trip.destination}
+    return [
+        {**route, "day": booked_at.astimezone(timezone.utc).date(), "bookings": 1, "tickets_sold": seat_count, "revenue": fare},
+        {**route, "day": trip.departure_time.date(), "seats_booked": seat_count},
+    ]
+
+def trip_deltas(trip: models.Trip, total_seats: int) -> dict:
+    """A newly scheduled trip adds its capacity to its departure day."""
+    return {
+        "day": trip.departure_time.date(), "bus_id": trip.bus_id,
+        "source": trip.source, "destination": trip.destination,
+        "trips": 1, "seats_offered": total_seats
+    }
+
+def rebuild_rollups(db: Session) -> int:
+    """
+    Recomputes every rollup row from trips and booking headers in one
+    INSERT ... SELECT. Rollups are maintained incrementally; this is the
+    backfill for existing data and the repair for any drift.
+    Returns the number of rows written.
+    """
+    Trip, Bus, Group = models.Trip, models.Bus, models.BookingGroup
+    zero = literal(0)
+    departures = (
+        select(
+            func.date(Trip.departure_time).label("day"), Trip.bus_id, Trip.source, Trip.destination,
+            literal(1).label("trips"), Bus.total_seats.label("seats_offered"),
+            (Bus.total_seats - Trip.available_seats).label("seats_booked"),
+            zero.label("bookings"), zero.label("tickets_sold"), zero.label("revenue")
+        )
+        .join(Bus, Trip.bus_id == Bus.id)
+    )
+    sales = (
+        select(
+            sale_day(db.bind.dialect.name).label("day"), Trip.bus_id, Trip.source, Trip.destination,
+            zero, zero, zero,
+            literal(1), Group.seat_count, Group.total_fare
+        )
+        .join(Trip, Group.trip_id == Trip.id)
+    )
+    facts = union_all(departures, sales).subquery()
+    key = [facts.c.day, facts.c.bus_id, facts.c.source, facts.c.destination]
+    totals = select(*key, *[func.sum(facts.c[m]) for m in MEASURES]).group_by(*key)
+
+    db.execute(delete(models.DailyRollup))
+    result = db.execute(
+        insert(models.DailyRollup).from_select(["day", "bus_id", "source", "destination", *MEASURES], totals)
+    )
+    db.commit()
+    return result.rowcount
+
+if __name__ == "__main__":
+    # Usage: python -m src.rollups
+    db = SessionLocal()
+    try:
+        print(f"Rebuilt {rebuild_rollups(db)} daily rollup rows")
+    finally:
+        db.close()
@@ -1,75 +1,126 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from sqlalchemy import func, desc
-from datetime import datetime, timedelta, time
-from .. import models, database
-from ..database import get_db
-
-router = APIRouter(prefix="/admin", tags=["Admin"])
-
-@router.get("/analytics")
-def get_advanced_stats(db: Session = Depends(get_db)):
-    """
-    Fetches system-wide analytics including a 7-day revenue trend,
-    top performing buses, and general system metrics.
-    """
-    # 1. 7-Day Revenue Trend Logic
-    today = datetime.now().date()
-    revenue_trend = []
-    
-    for i in range(6, -1, -1):
-        target_date = today - timedelta(days=i)
-        
-        # Create start and end of the day timestamps for accurate filtering
-        start_of_day = datetime.combine(target_date, time.min)
-        end_of_day = datetime.combine(target_date, time.max)
-        
-        # Query total revenue for this 24-hour window
-        # We ensure floats are returned to avoid JSON serialization issues with Decimals
-        daily_rev = db.query(func.sum(models.Trip.price))\
-            .join(models.Booking, models.Trip.id == models.Booking.trip_id)\
-            .filter(models.Booking.created_at >= start_of_day)\
-            .filter(models.Booking.created_at <= end_of_day)\
-            .scalar() or 0
-            
-        revenue_trend.append({
-            "day": target_date.strftime("%a"), 
-            "amount": float(daily_rev)
-        })
-
-    # 2. Bus Performance (Revenue per Bus)
-    # Ensure join conditions are explicit to prevent Cartesian products
-    bus_stats = db.query(
-        models.Bus.bus_name,
-        func.count(models.Booking.id).label("total_tickets"),
-        func.sum(models.Trip.price).label("revenue")
-    ).join(models.Trip, models.Bus.id == models.Trip.bus_id)\
-     .join(models.Booking, models.Trip.id == models.Booking.trip_id)\
-     .group_by(models.Bus.id, models.Bus.bus_name)\
-     .order_by(desc("revenue")).limit(5).all()
-
-    # 3. Quick Metrics
-    total_users = db.query(func.count(models.User.id)).scalar() or 0
-    
-    # Calculate actual occupancy based on total bookings vs total capacity
-    total_bookings = db.query(func.count(models.Booking.id)).scalar() or 0
-    total_trips = db.query(func.count(models.Trip.id)).scalar() or 1 # Avoid div by zero
-    # Assuming standard bus capacity is 40
-    calculated_occupancy = round((total_bookings / (total_trips * 40)) * 100, 1)
-
-    return {
-        "trend": revenue_trend,
-        "bus_performance": [
-            {
-                "name": b.bus_name, 
-                "tickets": int(b.total_tickets), 
-                "revenue": float(b.revenue) if b.revenue else 0.0
-            } 
-            for b in bus_stats
-        ],
-        "metrics": {
-            "users": int(total_users),
-            "occupancy": calculated_occupancy,
-            "revenue": sum(d['amount'] for d in revenue_trend)
-        }
-    }
\ No newline at end of file
+import os
+from collections import defaultdict
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from sqlalchemy import func
+from datetime import date, datetime, timedelta, timezone
+from typing import Literal, Optional
+from .. import export, models, database, oauth2, schemas, search_cache
+from ..database import get_db
+
+router = APIRouter(prefix="/admin", tags=["Admin"])
+
+# Longest range one analytics request may aggregate (days, inclusive)
+ANALYTICS_MAX_DAYS = int(os.getenv("ANALYTICS_MAX_DAYS", 366))
+
+@router.get("/analytics")
+def get_advanced_stats(
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    db: Session = Depends(get_db),
+    admin: schemas.Principal = Depends(oauth2.get_current_admin)
+):
+    """
+    Fetches analytics for a date range (default: the last 7 days, at most
+    ANALYTICS_MAX_DAYS) including the daily revenue trend, top performing
+    buses and occupancy. Everything except the user count comes from one
+    query over the daily rollups.
+    """
+    # Sales are counted on UTC dates (see rollups.sale_day)
+    end = end or datetime.now(timezone.utc).date()
+    start = start or end - timedelta(days=6)
+    if start > end:
+        raise HTTPException(status_code=422, detail="start must not be after end")
+    if (end - start).days + 1 > ANALYTICS_MAX_DAYS:
+        raise HTTPException(status_code=422, detail=f"The range may span at most {ANALYTICS_MAX_DAYS} days")
+
+    # 1. One pass over the rollups: per day and bus within the range
+    # Revenue is counted on the day it was booked, occupancy on the day of departure
+    Rollup = models.DailyRollup
+    rows = db.query(
+        Rollup.day,
+        models.Bus.id,
+        models.Bus.bus_name,
+        func.sum(Rollup.revenue).label("revenue"),
+        func.sum(Rollup.tickets_sold).label("tickets"),
+        func.sum(Rollup.seats_offered).label("seats_offered"),
+        func.sum(Rollup.seats_booked).label("seats_booked")
+    ).join(models.Bus, Rollup.bus_id == models.Bus.id)\
+     .filter(Rollup.day.between(start, end))\
+     .group_by(Rollup.day, models.Bus.id, models.Bus.bus_name).all()
+
+    # 2. Fold the rows into the daily trend and the per-bus totals
+    daily_revenue = defaultdict(int)
+    buses = {}
+    seats_offered = seats_booked = 0
+    for r in rows:
+        daily_revenue[r.day] += r.revenue
+        bus = buses.setdefault(r.id, {"name": r.bus_name, "tickets": 0, "revenue": 0.0})
+        bus["tickets"] += int(r.tickets)
+        bus["revenue"] += float(r.revenue)
+        seats_offered += r.seats_offered
+        seats_booked += r.seats_booked
+
+    revenue_trend = [
+        {
+            "day": day.strftime("%a"),
+            "date": day.isoformat(),
+            "amount": float(daily_revenue[day])
+        }
+        for day in (start + timedelta(days=i) for i in range((end - start).days + 1))
+    ]
+    # Buses with no sales in the range are not "top performing"
+    bus_performance = sorted(
+        (b for b in buses.values() if b["tickets"]), key=lambda b: b["revenue"], reverse=True
+    )[:5]
+
+    # 3. Quick Metrics
+    total_users = db.query(func.count(models.User.id)).scalar() or 0
+
+    # Occupancy: seats booked over the real capacity of the trips departing in the range
+    calculated_occupancy = round(seats_booked / seats_offered * 100, 1) if seats_offered else 0.0
+
+    return {
+        "trend": revenue_trend,
+        "bus_performance": bus_performance,
+        "metrics": {
+            "users": int(total_users),
+            "occupancy": calculated_occupancy,
+            "revenue": sum(d['amount'] for d in revenue_trend)
+        }
+    }
+
+@router.get("/search-cache")
+async def get_search_cache_stats(admin: schemas.Principal = Depends(oauth2.get_current_admin)):
+    """
+    Hit/miss counters of the trip search cache, summed over all workers.
+    """
+    return await search_cache.stats()
+
+@router.get("/export/bookings")
+def export_bookings(
+    format: Literal["csv", "ndjson"] = "csv",
+    date_from: Optional[date] = Query(None, alias="from"),
+    date_to: Optional[date] = Query(None, alias="to"),
+    by: Literal["booked", "departure"] = "booked",
+    source: Optional[str] = None,
+    destination: Optional[str] = None,
+    gzip: bool = False,
+    admin: schemas.Principal = Depends(oauth2.get_current_admin)
+):
+    """
+    Streams every booked seat with its trip, bus and user as CSV or NDJSON.
+    Rows come from a server-side cursor in fixed-size batches, so memory use
+    does not grow with the size of the export.
+    """
+    encode, media_type = export.FORMATS[format]
+    chunks = encode(export.iter_batches(export.export_query(date_from, date_to, by, source, destination)))
+    filename = f"bookings.{format}"
+    headers = {}
+    if gzip:
+        chunks = export.gzip_chunks(chunks)
+        media_type = "application/gzip"
+        filename += ".gz"
+    headers["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
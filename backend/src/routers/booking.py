@@ -1,171 +1,395 @@
-import uuid
-import os
-from celery import Celery
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from typing import List
-
-from .. import models, schemas, oauth2
-from ..database import get_db
-from ..dependencies import manager, redis_client
-
-# Initialize a Celery client to send tasks without importing the worker file
-REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
-celery_client = Celery(broker=REDIS_URL)
-
-router = APIRouter(
-    prefix="/bookings",
-    tags=["Bookings"]
-)
-
-# --- 1. Real-time Seat Locking ---
-
-@router.post("/lock-seat/{trip_id}/{seat_no}")
-async def lock_seat(
-    trip_id: int, 
-    seat_no: int, 
-    db: Session = Depends(get_db), 
-    current_user: models.User = Depends(oauth2.get_current_user)
-):
-    lock_key = f"lock:{trip_id}:{seat_no}"
-    existing_owner = redis_client.get(lock_key)
-
-    if existing_owner and existing_owner != str(current_user.id):
-        raise HTTPException(status_code=400, detail="Seat occupied")
-
-    redis_client.set(lock_key, current_user.id, ex=300)
-
-    await manager.broadcast(int(trip_id), {
-        "type": "SEAT_LOCKED",
-        "seat_no": int(seat_no),
-        "user_id": current_user.id
-    })
-    return {"status": "locked"}
-
-@router.post("/unlock-seat/{trip_id}/{seat_no}")
-async def unlock_seat(
-    trip_id: int, 
-    seat_no: int, 
-    current_user: models.User = Depends(oauth2.get_current_user)
-):
-    lock_key = f"lock:{trip_id}:{seat_no}"
-    owner_id = redis_client.get(lock_key)
-
-    if owner_id == str(current_user.id):
-        redis_client.delete(lock_key)
-        await manager.broadcast(int(trip_id), {
-            "type": "SEAT_UNLOCKED",
-            "seat_no": int(seat_no),
-            "user_id": current_user.id
-        })
-        return {"message": "Seat released"}
-    
-    return {"message": "No action taken"}
-
-# --- 2. Finalize Booking (The "Pay" Step) ---
-
-@router.post("/", status_code=status.HTTP_201_CREATED)
-async def create_booking(
-    booking_data: schemas.BookingCreate, 
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user)
-):
-    current_user.gender = booking_data.gender
-    current_user.age = booking_data.age
-    current_user.phone_number = booking_data.phone_number
-    db.add(current_user)
-
-    trip = db.query(models.Trip).filter(models.Trip.id == booking_data.trip_id).first()
-    if not trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
-
-    target_seats = db.query(models.Seat).filter(
-        models.Seat.trip_id == booking_data.trip_id,
-        models.Seat.seat_number.in_(booking_data.seat_numbers)
-    ).all()
-
-    if len(target_seats) != len(booking_data.seat_numbers):
-        raise HTTPException(status_code=400, detail="Invalid seat numbers")
-
-    group_pnr = f"ABC-{uuid.uuid4().hex[:6].upper()}"
-
-    try:
-        for seat in target_seats:
-            if seat.is_booked:
-                raise HTTPException(status_code=400, detail=f"Seat {seat.seat_number} already booked")
-            
-            seat.is_booked = True
-            new_booking = models.Booking(
-                booking_number=group_pnr,
-                user_id=current_user.id,
-                trip_id=booking_data.trip_id,
-                seat_id=seat.id,
-                status="confirmed"
-            )
-            db.add(new_booking)
-            redis_client.delete(f"lock:{booking_data.trip_id}:{seat.seat_number}")
-        
-        db.commit()
-
-        await manager.broadcast(int(booking_data.trip_id), {
-            "type": "SEAT_BOOKED",
-            "seat_numbers": [int(n) for n in booking_data.seat_numbers]
-        })
-
-        # --- TRIGGER CELERY TASK BY NAME ---
-        # Using send_task prevents the need to import from celery_worker.py
-        celery_client.send_task("send_booking_email_task", args=[current_user.email, group_pnr])
-            
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
-        
-    return {"success": True, "booking_number": group_pnr}
-
-# --- 3. Retrieval Routes ---
-
-@router.get("/my-tickets")
-def get_user_bookings(
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user)
-):
-    bookings = db.query(models.Booking).filter(models.Booking.user_id == current_user.id).all()
-    grouped = {}
-    for b in bookings:
-        if b.booking_number not in grouped:
-            grouped[b.booking_number] = {
-                "booking_number": b.booking_number,
-                "trip": b.trip,
-                "status": b.status,
-                "created_at": b.created_at,
-                "seats": []
-            }
-        grouped[b.booking_number]["seats"].append(b.seat.seat_number)
-    
-    return list(grouped.values())
-
-@router.get("/{booking_number}")
-def get_booking(
-    booking_number: str,
-    db: Session = Depends(get_db),
-    current_user: models.User = Depends(oauth2.get_current_user)
-):
-    bookings = db.query(models.Booking).filter(
-        models.Booking.booking_number == booking_number,
-        models.Booking.user_id == current_user.id
-    ).all()
-    
-    if not bookings:
-        raise HTTPException(status_code=404, detail="Booking not found")
-        
-    return {
-        "booking_number": booking_number,
-        "trip": bookings[0].trip,
-        "seats": [b.seat.seat_number for b in bookings],
-        "status": bookings[0].status,
-        "created_at": bookings[0].created_at,
-        "user_details": {
-            "name": bookings[0].user.username,
-            "phone": bookings[0].user.phone_number
-        }
-    }
\ No newline at end of file
+import uuid
+import os
+import logging
+from celery import Celery
+from fastapi import APIRouter, Depends, Header, HTTPException, Path, Query, Request, Response, status
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import literal, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from datetime import datetime, timezone
+from typing import List, Literal, Optional
+
+from .. import boarding_pass, conditional, models, schemas, oauth2, principals, rollups, seat_locks, seat_map, search_cache
+from ..idempotency import IdempotentRequest
+from ..database import get_async_db
+from ..dependencies import manager
+
+# Initialize a Celery client to send tasks without importing the worker file
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+celery_client = Celery(broker=REDIS_URL)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(
+    prefix="/bookings",
+    tags=["Bookings"]
+)
+
+# --- 1. Real-time Seat Locking ---
+
+async def _hold_seats(db: AsyncSession, trip_id: int, seat_numbers: List[int], user_id: int):
+    """Runs the atomic lock script and maps a rejection onto an HTTP error."""
+    # Holds on a trip that doesn't exist would still count against the cap
+    if not await seat_map.trip_exists(db, trip_id):
+        raise HTTPException(status_code=404, detail="Trip not found")
+    code, payload = await seat_locks.lock_seats(trip_id, seat_numbers, user_id)
+    if code == seat_locks.LOCK_CONFLICT:
+        raise HTTPException(status_code=400, detail=f"Seat occupied: {', '.join(map(str, payload))}")
+    if code == seat_locks.LOCK_LIMIT:
+        raise HTTPException(status_code=400, detail=f"Max {seat_locks.MAX_SEATS_PER_USER} seats")
+
+@router.post("/lock-seat/{trip_id}/{seat_no}")
+async def lock_seat(
+    trip_id: int, 
+    seat_no: int = Path(ge=1, le=seat_map.MAX_SEATS), 
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    await _hold_seats(db, trip_id, [seat_no], current_user.id)
+
+    await manager.broadcast(int(trip_id), {
+        "type": "SEAT_LOCKED",
+        "seat_no": int(seat_no),
+        "user_id": current_user.id
+    })
+    return {"status": "locked"}
+
+@router.post("/unlock-seat/{trip_id}/{seat_no}")
+async def unlock_seat(
+    trip_id: int, 
+    seat_no: int = Path(ge=1, le=seat_map.MAX_SEATS), 
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    if await seat_locks.unlock_seats(trip_id, [seat_no], current_user.id):
+        await manager.broadcast(int(trip_id), {
+            "type": "SEAT_UNLOCKED",
+            "seat_no": int(seat_no),
+            "user_id": current_user.id
+        })
+        return {"message": "Seat released"}
+    
+    return {"message": "No action taken"}
+
+@router.post("/lock-seats/{trip_id}")
+async def lock_seats(
+    trip_id: int,
+    request: schemas.SeatLockRequest,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    """
+    Holds several seats in one atomic step: either every seat is locked for
+    the caller or none is. Viewers receive a single SEATS_LOCKED event.
+    """
+    await _hold_seats(db, trip_id, request.seat_numbers, current_user.id)
+
+    await manager.broadcast(int(trip_id), {
+        "type": "SEATS_LOCKED",
+        "seat_numbers": request.seat_numbers,
+        "user_id": current_user.id
+    })
+    return {"status": "locked", "seat_numbers": request.seat_numbers}
+
+@router.post("/unlock-seats/{trip_id}")
+async def unlock_seats(
+    trip_id: int,
+    request: schemas.SeatLockRequest,
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    """Releases the subset of the given seats that the caller holds."""
+    released = await seat_locks.unlock_seats(trip_id, request.seat_numbers, current_user.id)
+    if released:
+        await manager.broadcast(int(trip_id), {
+            "type": "SEATS_UNLOCKED",
+            "seat_numbers": released,
+            "user_id": current_user.id
+        })
+    return {"message": "Seats released" if released else "No action taken", "seat_numbers": released}
+
+# --- 2. Finalize Booking (The "Pay" Step) ---
+
+async def _best_effort(pnr: str, action: str, awaitable):
+    """Awaits a post-commit side effect, logging instead of raising on failure."""
+    try:
+        await awaitable
+    except Exception:
+        logger.exception("Booking %s committed, but %s failed", pnr, action)
+
+@router.post("/", status_code=status.HTTP_201_CREATED)
+async def create_booking(
+    booking_data: schemas.BookingCreate, 
+    db: AsyncSession = Depends(get_async_db),
+    principal: schemas.Principal = Depends(oauth2.get_current_principal),
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+):
+    """
+    With an `Idempotency-Key` header, a retried request gets the stored
+    response of the first one back instead of booking twice; replays never
+    reach the database or Celery.
+    """
+    if not idempotency_key:
+        return await _create_booking(booking_data, db, principal)
+
+    # Keys are per user, so two users can never collide on one
+    idem = IdempotentRequest(f"booking:{principal.id}", idempotency_key, booking_data)
+    replay = await idem.start()
+    if replay is not None:
+        return replay
+    try:
+        return await _create_booking(booking_data, db, principal, idem)
+    except Exception:
+        # Only attempts that never committed get here (everything after the
+        # commit is best-effort), so the client may retry. Should Redis fail
+        # too, the marker simply expires after IDEMPOTENCY_PENDING_SECONDS
+        try:
+            await idem.abandon()
+        except Exception:
+            logger.exception("Could not free Idempotency-Key %s", idem.redis_key)
+        raise
+
+async def _create_booking(
+    booking_data: schemas.BookingCreate,
+    db: AsyncSession,
+    principal: schemas.Principal,
+    idem: Optional[IdempotentRequest] = None
+):
+    # The booking updates the profile, so this route needs the ORM row itself
+    current_user = await db.get(models.User, principal.id)
+    current_user.gender = booking_data.gender
+    current_user.age = booking_data.age
+    current_user.phone_number = booking_data.phone_number
+    db.add(current_user)
+
+    trip = await db.get(models.Trip, booking_data.trip_id, options=[selectinload(models.Trip.bus)])
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    seat_numbers = booking_data.seat_numbers
+    if len(set(seat_numbers)) != len(seat_numbers) or not all(1 <= n <= trip.bus.total_seats for n in seat_numbers):
+        raise HTTPException(status_code=400, detail="Invalid seat numbers")
+
+    # The caller must still hold every seat it books; the claim is atomic in
+    # Redis and keeps the holds alive until the transaction below has committed
+    not_held = await seat_locks.claim_seats(trip.id, seat_numbers, current_user.id)
+    if not_held:
+        raise HTTPException(status_code=400, detail=f"Seat hold expired or not yours: {', '.join(map(str, not_held))}")
+
+    # Take every seat with one conditional UPDATE on the trip's seat bitmap:
+    # it only matches while none of the requested bits are set, and bumps the
+    # availability counter in the same statement
+    mask = seat_map.seat_mask(seat_numbers)
+    result = await db.execute(
+        update(models.Trip)
+        .where(models.Trip.id == trip.id, models.Trip.booked_seats.bitwise_and(mask) == 0)
+        .values(
+            booked_seats=models.Trip.booked_seats.bitwise_or(mask),
+            available_seats=models.Trip.available_seats - len(seat_numbers)
+        )
+        .execution_options(synchronize_session=False)
+    )
+    if result.rowcount != 1:
+        booked = await db.scalar(select(models.Trip.booked_seats).where(models.Trip.id == trip.id))
+        taken = seat_map.decode(booked & mask)
+        raise HTTPException(status_code=400, detail=f"Seat {', '.join(map(str, taken))} already booked")
+
+    group_pnr = f"ABC-{uuid.uuid4().hex[:6].upper()}"
+
+    # One timestamp for the whole PNR; ticket history pages on it
+    booked_at = datetime.now(timezone.utc)
+
+    try:
+        # The PNR header carries the fare snapshot; each seat is one line under it
+        db.add(models.BookingGroup(
+            booking_number=group_pnr,
+            user_id=current_user.id,
+            trip_id=trip.id,
+            seat_count=len(seat_numbers),
+            total_fare=trip.price * len(seat_numbers),
+            status="confirmed",
+            created_at=booked_at,
+            seats=[
+                models.Booking(
+                    booking_number=group_pnr,
+                    user_id=current_user.id,
+                    trip_id=trip.id,
+                    seat_number=n,
+                    status="confirmed",
+                    created_at=booked_at
+                )
+                for n in seat_numbers
+            ]
+        ))
+
+        # Dashboard totals move in the same transaction as the booking
+        await db.execute(rollups.increment_stmt(db.bind.dialect.name), rollups.merge_deltas(rollups.booking_deltas(
+            trip, len(seat_numbers), trip.price * len(seat_numbers), booked_at
+        )))
+        
+        await db.commit()
+    except Exception:
+        await db.rollback()
+        logger.exception("Booking %s for trip %s could not be committed", group_pnr, booking_data.trip_id)
+        raise HTTPException(status_code=500, detail="Booking could not be completed, please try again")
+
+    # The booking is durable from here on. Everything below only refreshes
+    # caches and notifies; a failure is logged and never turns it into a 500
+    response_body = {"success": True, "booking_number": group_pnr}
+
+    # Record the outcome first, so a retry arriving during the side effects
+    # below is replayed, not re-run
+    if idem:
+        await _best_effort(group_pnr, "storing the idempotent response", idem.complete(status.HTTP_201_CREATED, response_body))
+
+    # The profile fields above changed; later requests must not see the old ones
+    await _best_effort(group_pnr, "refreshing the principal", principals.refresh(current_user))
+
+    # Mirror the new bits, then release every hold in one round trip
+    await _best_effort(group_pnr, "mirroring the seat map", seat_map.mirror_booked(trip.id, seat_numbers))
+    await _best_effort(group_pnr, "releasing the holds", seat_locks.release_seats(trip.id, seat_numbers))
+
+    # The cached search listing this trip now shows a stale seat count
+    await _best_effort(group_pnr, "invalidating cached searches",
+                       search_cache.invalidate_trip(trip.source, trip.destination, trip.departure_time.date()))
+
+    await _best_effort(group_pnr, "broadcasting the booked seats", manager.broadcast(trip.id, {
+        "type": "SEAT_BOOKED",
+        "seat_numbers": [int(n) for n in seat_numbers]
+    }))
+
+    # --- TRIGGER CELERY TASK BY NAME ---
+    # Using send_task prevents the need to import from celery_worker.py
+    # The broker publish is a blocking call, so it runs in the threadpool
+    await _best_effort(group_pnr, "queueing the confirmation email", run_in_threadpool(
+        celery_client.send_task, "send_booking_email_task", args=[current_user.email, group_pnr]
+    ))
+
+    return response_body
+
+# --- 3. Retrieval Routes ---
+
+def _parse_ticket_cursor(after: str):
+    # Cursor format: "<created_at ISO>,<pnr>" of the last ticket on the previous page
+    created_at, _, pnr = after.rpartition(",")
+    try:
+        return datetime.fromisoformat(created_at), pnr
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+@router.get("/my-tickets", response_model=schemas.TicketPage)
+async def get_user_bookings(
+    after: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=100),
+    when: Optional[Literal["upcoming", "past"]] = None,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    """
+    Newest-first ticket history, one entry per PNR: one query over the
+    booking headers plus one for their seat lines. Pages are keyed on
+    (created_at, PNR), which walks ix_booking_groups_user_created instead
+    of counting an OFFSET.
+    """
+    Group = models.BookingGroup
+    stmt = (
+        select(Group)
+        .join(Group.trip)
+        .where(Group.user_id == current_user.id)
+        .options(contains_eager(Group.trip), selectinload(Group.seats))
+        .order_by(Group.created_at.desc(), Group.booking_number.desc())
+        .limit(limit + 1)
+    )
+    if after:
+        cursor_at, cursor_pnr = _parse_ticket_cursor(after)
+        stmt = stmt.where(
+            tuple_(Group.created_at, Group.booking_number) < tuple_(literal(cursor_at, Group.created_at.type), cursor_pnr)
+        )
+    if when == "upcoming":
+        stmt = stmt.where(models.Trip.departure_time >= datetime.now())
+    elif when == "past":
+        stmt = stmt.where(models.Trip.departure_time < datetime.now())
+
+    groups = (await db.scalars(stmt)).all()
+    items = [
+        {
+            "booking_number": g.booking_number,
+            "status": g.status,
+            "created_at": g.created_at,
+            "seats": g.seat_numbers,
+            "trip": g.trip
+        }
+        for g in groups[:limit]
+    ]
+    next_cursor = None
+    if len(groups) > limit:
+        last = groups[limit - 1]
+        next_cursor = f"{last.created_at.isoformat()},{last.booking_number}"
+    return {"items": items, "next_cursor": next_cursor}
+
+@router.get("/{booking_number}", response_model=schemas.BookingDetail)
+async def get_booking(
+    booking_number: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    # One header row (with trip and user joined) plus one indexed query for its seats
+    group = await db.scalar(
+        select(models.BookingGroup)
+        .where(
+            models.BookingGroup.booking_number == booking_number,
+            models.BookingGroup.user_id == current_user.id
+        )
+        .options(
+            joinedload(models.BookingGroup.trip),
+            joinedload(models.BookingGroup.user),
+            selectinload(models.BookingGroup.seats)
+        )
+    )
+    
+    if not group:
+        raise HTTPException(status_code=404, detail="Booking not found")
+        
+    return {
+        "booking_number": group.booking_number,
+        "trip": group.trip,
+        "seats": group.seat_numbers,
+        "status": group.status,
+        "created_at": group.created_at,
+        "total_fare": group.total_fare,
+        "user_details": {
+            "name": group.user.username,
+            "phone": group.user.phone_number
+        }
+    }
+
+@router.get("/{booking_number}/ticket.pdf")
+async def download_ticket(
+    booking_number: str,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: schemas.Principal = Depends(oauth2.get_current_principal)
+):
+    """
+    The PDF boarding pass. It is served from the content-addressed pass
+    cache and only rendered when what it shows has changed; its fingerprint
+    doubles as the ETag, so an unchanged pass is not even re-sent.
+    """
+    group = await db.scalar(
+        select(models.BookingGroup)
+        .where(
+            models.BookingGroup.booking_number == booking_number,
+            models.BookingGroup.user_id == current_user.id
+        )
+        .options(joinedload(models.BookingGroup.trip), selectinload(models.BookingGroup.seats))
+    )
+    if not group:
+        raise HTTPException(status_code=404, detail="Booking not found")
+
+    etag = f'"{boarding_pass.fingerprint(group)}"'
+    if conditional.not_modified(request, response, etag, "private, no-cache"):
+        return conditional.response_304(response)
+
+    _, pdf = await boarding_pass.get_pdf(group)
+    response.headers["Content-Disposition"] = f'inline; filename="{booking_number}.pdf"'
+    return Response(content=pdf, media_type="application/pdf", headers=dict(response.headers))
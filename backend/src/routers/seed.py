@@ -1,32 +1,42 @@
-import os
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
-import shutil
-from sqlalchemy.orm import Session
-from ..database import get_db
-from ..seed import seed_data
-
-router = APIRouter(prefix="/setup", tags=["Database Setup"])
-
-@router.post("/seed-schedule")
-async def run_seed(
-    file: UploadFile = File(...), 
-    db: Session = Depends(get_db)
-):
-    if not file.filename.endswith(('.xlsx', '.xls')):
-        raise HTTPException(status_code=400, detail="Invalid file type. Please upload an Excel file.")
-
-    temp_path = f"temp_{file.filename}"
-    try:
-        # Save uploaded file temporarily
-        with open(temp_path, "wb") as buffer:
-            shutil.copyfileobj(file.file, buffer)
-        
-        seed_data(temp_path, db)
-        return {"status": "success", "message": "Database seeded successfully from uploaded file."}
-    
-    except Exception as e:
-        db.rollback()
-        raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        if os.path.exists(temp_path):
-            os.remove(temp_path)
\ No newline at end of file
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, UploadFile, File, status
+from starlette.concurrency import run_in_threadpool
+from .. import oauth2, schemas, seed_jobs
+from .booking import celery_client
+
+router = APIRouter(prefix="/setup", tags=["Database Setup"])
+
+@router.post("/seed-schedule", status_code=status.HTTP_202_ACCEPTED)
+async def run_seed(
+    file: UploadFile = File(...),
+    weeks: Optional[int] = Query(None, ge=1, le=seed_jobs.MAX_SEED_WEEKS),
+    admin: schemas.Principal = Depends(oauth2.get_current_admin)
+):
+    """
+    Queues a schedule import on the Celery worker and returns its job id
+    straight away. Without `weeks`, one week is scheduled after the latest
+    trip; with it, every week up to that horizon that is still missing trips.
+    """
+    if not file.filename.endswith(('.xlsx', '.xls')):
+        raise HTTPException(status_code=400, detail="Invalid file type. Please upload an Excel file.")
+
+    # The upload is spooled by Starlette; read it without touching the CWD
+    content = await file.read(seed_jobs.MAX_SEED_UPLOAD_BYTES + 1)
+    if len(content) > seed_jobs.MAX_SEED_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail="Schedule file is too large")
+
+    job_id = await seed_jobs.create_job(file.filename, content, weeks)
+    # The broker publish is a blocking call, so it runs in the threadpool
+    await run_in_threadpool(celery_client.send_task, "seed_schedule_task", args=[job_id])
+    return {"status": "queued", "job_id": job_id}
+
+@router.get("/seed-jobs/{job_id}")
+async def get_seed_job(job_id: str, admin: schemas.Principal = Depends(oauth2.get_current_admin)):
+    """
+    State (queued, running, done or failed) and progress of a seed job:
+    `processed` of `total` trips handled, `created` of them new.
+    """
+    job = await seed_jobs.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Seed job not found")
+    return job
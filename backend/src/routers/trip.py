@@ -1,71 +1,106 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import and_
-from datetime import datetime, date, timedelta
-from ..database import get_db
-from .. import models, schemas
-from typing import List
-
-router = APIRouter(prefix="/trips", tags=["Trips"])
-
-@router.get("/search", response_model=List[schemas.TripSearchResponse])
-def search_trips(
-    source: str, 
-    destination: str, 
-    travel_date: date, 
-    db: Session = Depends(get_db)
-):
-    # 1. Define start and end of the chosen day for filtering
-    start_of_day = datetime.combine(travel_date, datetime.min.time())
-    end_of_day = datetime.combine(travel_date, datetime.max.time())
-
-    # 2. Query Trips joined with Bus details
-    trips = db.query(models.Trip).join(models.Bus).filter(
-        models.Trip.source.ilike(source),
-        models.Trip.destination.ilike(destination),
-        models.Trip.departure_time.between(start_of_day, end_of_day)
-    ).all()
-
-    if not trips:
-        return []
-
-    # 3. Format result (including bus details and available seat count)
-    results = []
-    for trip in trips:
-        # Count available seats for this specific trip
-        available_seats = db.query(models.Seat).filter(
-            models.Seat.trip_id == trip.id, 
-            models.Seat.is_booked == False
-        ).count()
-
-        results.append({
-            "trip_id": trip.id,
-            "bus_name": trip.bus.bus_name,
-            "bus_type": trip.bus.bus_type,
-            "source": trip.source,
-            "destination": trip.destination,
-            "departure_time": trip.departure_time,
-            "arrival_time": trip.arrival_time,
-            "price": trip.price,
-            "available_seats": available_seats
-        })
-
-    return results
-
-@router.get("/{trip_id}/seats")
-def get_trip_seats(trip_id: int, db: Session = Depends(get_db)):
-    # Fetch all seats for the selected trip to show on the layout
-    seats = db.query(models.Seat).filter(models.Seat.trip_id == trip_id).order_by(models.Seat.seat_number).all()
-    if not seats:
-        raise HTTPException(status_code=404, detail="No seats found for this trip")
-    return seats
-
-@router.get("/{trip_id}")
-def get_trip_by_id(trip_id: int, db: Session = Depends(get_db)):
-    trip = db.query(models.Trip).filter(models.Trip.id == trip_id).first()
-    
-    if not trip:
-        raise HTTPException(status_code=404, detail="Trip not found")
-        
-    return trip
-    
\ No newline at end of file
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
+from sqlalchemy import and_, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager
+from datetime import datetime, date, timedelta
+from ..database import get_async_db
+from .. import conditional, models, schemas, search_cache, seat_locks
+from typing import List
+
+router = APIRouter(prefix="/trips", tags=["Trips"])
+
+async def _query_trips(db: AsyncSession, source: str, destination: str, travel_date: date) -> list:
+    # 1. Define start and end of the chosen day for filtering
+    start_of_day = datetime.combine(travel_date, datetime.min.time())
+    end_of_day = datetime.combine(travel_date, datetime.max.time())
+
+    # 2. Query Trips joined with Bus details; availability is a maintained
+    # counter on the trip, so the whole result comes from this one query.
+    # Cities are compared as lower() so ix_trips_route_departure applies.
+    trips = (await db.scalars(
+        select(models.Trip).join(models.Bus).options(contains_eager(models.Trip.bus)).where(
+            func.lower(models.Trip.source) == search_cache.normalize(source),
+            func.lower(models.Trip.destination) == search_cache.normalize(destination),
+            models.Trip.departure_time.between(start_of_day, end_of_day)
+        )
+    )).all()
+
+    # 3. Format result (including bus details and available seat count)
+    return [
+        {
+            "trip_id": trip.id,
+            "bus_name": trip.bus.bus_name,
+            "bus_type": trip.bus.bus_type,
+            "source": trip.source,
+            "destination": trip.destination,
+            "departure_time": trip.departure_time,
+            "arrival_time": trip.arrival_time,
+            "price": trip.price,
+            "available_seats": trip.available_seats
+        }
+        for trip in trips
+    ]
+
+@router.get("/search", response_model=List[schemas.TripSearchResponse])
+async def search_trips(
+    source: str,
+    destination: str,
+    travel_date: date,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    source, destination = source.strip(), destination.strip()
+    # Served from Redis when possible; bookings and seeding invalidate the entry
+    results, etag = await search_cache.get_or_load(
+        db, source, destination, travel_date,
+        lambda session: _query_trips(session, source, destination, travel_date)
+    )
+    if conditional.not_modified(request, response, etag):
+        return conditional.response_304(response)
+    return results
+
+@router.get("/{trip_id}/seats", response_model=List[schemas.SeatResponse])
+async def get_trip_seats(
+    trip_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    # The version is read before the database so the ETag is never newer
+    # than the body it is attached to
+    version = await seat_locks.trip_version(trip_id)
+    if conditional.not_modified(request, response, f'W/"seats-{trip_id}-{version}"'):
+        return conditional.response_304(response)
+
+    # The seat layout is decoded from the trip's booked-seat bitmap
+    row = (await db.execute(
+        select(models.Trip.booked_seats, models.Bus.total_seats)
+        .join(models.Bus, models.Trip.bus_id == models.Bus.id)
+        .where(models.Trip.id == trip_id)
+    )).first()
+    if not row:
+        raise HTTPException(status_code=404, detail="No seats found for this trip")
+    booked, total_seats = row
+    return [
+        {"seat_number": n, "is_booked": bool(booked >> (n - 1) & 1)}
+        for n in range(1, total_seats + 1)
+    ]
+
+@router.get("/{trip_id}", response_model=schemas.TripDetail)
+async def get_trip_by_id(
+    trip_id: int,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    version = await seat_locks.trip_version(trip_id)
+    if conditional.not_modified(request, response, f'W/"trip-{trip_id}-{version}"'):
+        return conditional.response_304(response)
+
+    trip = await db.get(models.Trip, trip_id)
+
+    if not trip:
+        raise HTTPException(status_code=404, detail="Trip not found")
+
+    return trip
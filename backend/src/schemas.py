@@ -1,130 +1,191 @@
-from pydantic import BaseModel, EmailStr
-from datetime import datetime
-from typing import Optional, List
-
-# --- User Schemas ---
-
-class UserLogin(BaseModel):
-    """Schema for user authentication requests."""
-    email: EmailStr
-    password: str
-
-class UserBase(BaseModel):
-    """Base schema for shared user attributes."""
-    username: str
-    email: EmailStr
-
-class UserCreate(UserBase):
-    """Schema for new user registration; includes password."""
-    password: str
-
-class UserResponse(UserBase):
-    """Standard user representation for API responses."""
-    id: int
-    is_admin: bool
-    
-    class Config:
-        # Allows Pydantic to read data from SQLAlchemy models (ORM mode)
-        from_attributes = True
-
-class UserMeResponse(BaseModel):
-    """Detailed user profile schema for the 'current user' endpoint."""
-    id: int
-    email: EmailStr
-    username: str
-    is_admin: bool
-    phone_number: str | None = None
-    age: int | None = None
-    gender: str | None = None
-
-    class Config:
-        from_attributes = True
-
-# --- Seat & Trip Schemas ---
-
-class SeatResponse(BaseModel):
-    """Schema representing an individual seat's status for a trip."""
-    id: int
-    seat_number: int
-    is_booked: bool
-    is_locked: bool
-    
-    class Config:
-        from_attributes = True
-
-class TripResponse(BaseModel):
-    """Detailed trip schema including the full list of seats."""
-    id: int
-    bus_id: int
-    departure_time: datetime
-    price: int
-    seats: List[SeatResponse] = []
-
-    class Config:
-        from_attributes = True
-
-# --- Booking Schemas ---
-
-class BookingCreate(BaseModel):
-    """Schema for creating a new booking reservation."""
-    trip_id: int
-    seat_numbers: List[int]
-    gender: str
-    age: int
-    phone_number: str
-
-    class Config:
-        from_attributes = True
-
-class TripInfo(BaseModel):
-    """Simplified trip details for nesting within booking responses."""
-    source: str
-    destination: str
-    departure_time: datetime
-    arrival_time: datetime
-    price: int
-
-    class Config:
-        from_attributes = True
-
-class SeatInfo(BaseModel):
-    """Simplified seat details for nesting within booking responses."""
-    seat_number: int
-
-    class Config:
-        from_attributes = True
-
-class BookingResponse(BaseModel):
-    """Full booking confirmation schema with nested trip and seat info."""
-    id: int
-    status: str
-    created_at: datetime
-    trip: TripInfo  # Nested trip details
-    seat: SeatInfo  # Nested seat details
-
-    class Config:
-        from_attributes = True
-
-class TripCreate(BaseModel):
-    """Schema for administrative trip creation."""
-    bus_id: int
-    source: str
-    destination: str
-    departure_time: datetime
-    arrival_time: datetime
-    price: int
-
-class TripSearchResponse(BaseModel):
-    """Schema for trip search results, including aggregated availability."""
-    trip_id: int
-    bus_name: str
-    bus_type: str
-    source: str
-    destination: str
-    departure_time: datetime
-    arrival_time: datetime
-    price: float
-    available_seats: int
-
-    class Config:
+from pydantic import BaseModel, EmailStr, Field, field_validator
+from datetime import datetime
+from typing import Annotated, Optional, List
+from .seat_locks import MAX_SEATS_PER_USER
+from .seat_map import MAX_SEATS
+
+# --- User Schemas ---
+
+class UserLogin(BaseModel):
+    """Schema for user authentication requests."""
+    email: EmailStr
+    password: str
+
+class UserBase(BaseModel):
+    """Base schema for shared user attributes."""
+    username: str
+    email: EmailStr
+
+class UserCreate(UserBase):
+    """Schema for new user registration; includes password."""
+    password: str
+
+class UserResponse(UserBase):
+    """Standard user representation for API responses."""
+    id: int
+    is_admin: bool
+    
+    class Config:
+        # Allows Pydantic to read data from SQLAlchemy models (ORM mode)
+        from_attributes = True
+
+class UserMeResponse(BaseModel):
+    """Detailed user profile schema for the 'current user' endpoint."""
+    id: int
+    email: EmailStr
+    username: str
+    is_admin: bool
+    phone_number: str | None = None
+    age: int | None = None
+    gender: str | None = None
+
+    class Config:
+        from_attributes = True
+
+class Principal(BaseModel):
+    """
+    The authenticated user as cached by `principals.py`: enough for
+    authorization and profile display without loading the ORM row.
+    """
+    id: int
+    email: str
+    username: str
+    is_admin: bool = False
+    phone_number: str | None = None
+    age: int | None = None
+    gender: str | None = None
+
+    class Config:
+        from_attributes = True
+
+# --- Seat & Trip Schemas ---
+
+class SeatResponse(BaseModel):
+    """Schema representing an individual seat's status for a trip."""
+    seat_number: int
+    is_booked: bool
+
+class TripResponse(BaseModel):
+    """Detailed trip schema including the full list of seats."""
+    id: int
+    bus_id: int
+    departure_time: datetime
+    price: int
+    seats: List[SeatResponse] = []
+
+    class Config:
+        from_attributes = True
+
+# --- Booking Schemas ---
+
+class BookingCreate(BaseModel):
+    """Schema for creating a new booking reservation."""
+    trip_id: int
+    seat_numbers: List[int]
+    gender: str
+    age: int
+    phone_number: str
+
+    class Config:
+        from_attributes = True
+
+class SeatLockRequest(BaseModel):
+    """Schema for holding or releasing several seats of one trip at once."""
+    # Bounded before the lock script sees it: no hold may exceed the per-user
+    # cap, and only seats a bitmap can represent are accepted
+    seat_numbers: List[Annotated[int, Field(ge=1, le=MAX_SEATS)]] = Field(min_length=1, max_length=MAX_SEATS_PER_USER)
+
+    @field_validator("seat_numbers")
+    @classmethod
+    def dedupe(cls, v: List[int]) -> List[int]:
+        # Preserve the requested order while dropping repeated seats
+        return list(dict.fromkeys(v))
+
+class TripInfo(BaseModel):
+    """Simplified trip details for nesting within booking responses."""
+    id: int
+    source: str
+    destination: str
+    departure_time: datetime
+    arrival_time: datetime
+    price: int
+
+    class Config:
+        from_attributes = True
+
+class TripDetail(TripInfo):
+    """
+    A trip as the API shows it. The internal `booked_seats` bitmap is left
+    out; GET /trips/{id}/seats gives the seat map instead.
+    """
+    bus_id: int
+    available_seats: int
+
+class SeatInfo(BaseModel):
+    """Simplified seat details for nesting within booking responses."""
+    seat_number: int
+
+    class Config:
+        from_attributes = True
+
+class BookingResponse(BaseModel):
+    """Full booking confirmation schema with nested trip and seat info."""
+    id: int
+    status: str
+    created_at: datetime
+    trip: TripInfo  # Nested trip details
+    seat: SeatInfo  # Nested seat details
+
+    class Config:
+        from_attributes = True
+
+class PassengerDetails(BaseModel):
+    name: str
+    phone: Optional[str] = None
+
+class BookingDetail(BaseModel):
+    """One PNR with its trip, seats and passenger, for the ticket page."""
+    booking_number: str
+    trip: TripDetail
+    seats: List[int]
+    status: str
+    created_at: datetime
+    total_fare: int
+    user_details: PassengerDetails
+
+class TicketSummary(BaseModel):
+    """One PNR in a user's ticket history: every seat booked together."""
+    booking_number: str
+    status: str
+    created_at: datetime
+    seats: List[int]
+    trip: TripInfo
+
+class TicketPage(BaseModel):
+    """A page of ticket history; pass `next_cursor` as `after` for the next one."""
+    items: List[TicketSummary]
+    next_cursor: Optional[str] = None
+
+class TripCreate(BaseModel):
+    """Schema for administrative trip creation."""
+    bus_id: int
+    source: str
+    destination: str
+    departure_time: datetime
+    arrival_time: datetime
+    price: int
+
+class TripSearchResponse(BaseModel):
+    """Schema for trip search results, including aggregated availability."""
+    trip_id: int
+    bus_name: str
+    bus_type: str
+    source: str
+    destination: str
+    departure_time: datetime
+    arrival_time: datetime
+    price: float
+    available_seats: int
+
+    class Config:
         from_attributes = True
\ No newline at end of file
@@ -0,0 +1,176 @@
+import os
+import json
+import time
+import hashlib
+import asyncio
+from datetime import date
+from typing import Awaitable, Callable, Iterable, List, Set, Tuple
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.ext.asyncio import AsyncSession
+from .cache import redis_client
+from .database import AsyncSessionLocal
+
+# Seconds a cached search result is served as fresh
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", 60))
+# Further seconds a result may be served stale while it is refreshed in the background
+SEARCH_CACHE_STALE_SECONDS = int(os.getenv("SEARCH_CACHE_STALE_SECONDS", 300))
+
+# Redis hash with the hit/miss counters, shared by every worker
+STATS_KEY = "search_cache:stats"
+
+# Lifetime of the generation counters below (seconds). They only have to
+# outlive a load in flight; a day keeps a counter from expiring and
+# restarting at a value a slow load has already seen
+GENERATION_TTL = 86400
+
+# Writes a loaded result only if neither its key nor its date was
+# invalidated since the load read the generations, so a load that raced a
+# booking or a seed cannot put the old availability back.
+# KEYS[1] entry, KEYS[2] key generation, KEYS[3] date generation, KEYS[4] date index
+# ARGV[1] key generation seen, ARGV[2] date generation seen, ARGV[3] entry, ARGV[4] lifetime
+STORE_LUA = """
+if (redis.call('GET', KEYS[2]) or '') ~= ARGV[1] or (redis.call('GET', KEYS[3]) or '') ~= ARGV[2] then
+    return 0
+end
+redis.call('SET', KEYS[1], ARGV[3], 'EX', ARGV[4])
+redis.call('SADD', KEYS[4], KEYS[1])
+redis.call('EXPIRE', KEYS[4], ARGV[4])
+return 1
+"""
+
+_store_script = redis_client.register_script(STORE_LUA)
+
+# Fire-and-forget tasks (stats, revalidation) are kept referenced until done
+_background: Set[asyncio.Task] = set()
+
+def normalize(value: str) -> str:
+    """Normalizes a city name the way the search matches it (case-insensitive)."""
+    return value.strip().lower()
+
+def cache_key(source: str, destination: str, travel_date: date) -> str:
+    """Cache entry for one (source, destination, date) search."""
+    return f"search:{normalize(source)}:{normalize(destination)}:{travel_date.isoformat()}"
+
+def date_index_key(travel_date: date) -> str:
+    """Redis set of every cached search key for one travel date."""
+    return f"search_cache:dates:{travel_date.isoformat()}"
+
+def generation_key(key: str) -> str:
+    """Counter bumped whenever a cache key (or date index) is invalidated."""
+    return f"{key}:gen"
+
+def _spawn(coro):
+    task = asyncio.create_task(coro)
+    _background.add(task)
+    task.add_done_callback(_background.discard)
+
+def _count(field: str):
+    _spawn(redis_client.hincrby(STATS_KEY, field, 1))
+
+def _etag(encoded_results: str) -> str:
+    return 'W/"search-%s"' % hashlib.sha1(encoded_results.encode()).hexdigest()[:16]
+
+def _generation_keys(key: str, travel_date: date) -> List[str]:
+    return [generation_key(key), generation_key(date_index_key(travel_date))]
+
+async def _generations(key: str, travel_date: date) -> List[str]:
+    """The key's and date's generations; read before loading, checked by _store."""
+    return [g or "" for g in await redis_client.mget(_generation_keys(key, travel_date))]
+
+async def _store(key: str, travel_date: date, results: list, generations: List[str]) -> str:
+    encoded = json.dumps(jsonable_encoder(results), separators=(",", ":"))
+    etag = _etag(encoded)
+    entry = json.dumps({"fresh_until": time.time() + SEARCH_CACHE_TTL, "etag": etag, "results": json.loads(encoded)})
+    lifetime = SEARCH_CACHE_TTL + SEARCH_CACHE_STALE_SECONDS
+    await _store_script(
+        keys=[key, *_generation_keys(key, travel_date), date_index_key(travel_date)],
+        args=[*generations, entry, lifetime]
+    )
+    return etag
+
+async def _revalidate(key: str, travel_date: date, loader: Callable[[AsyncSession], Awaitable[list]]):
+    # Only one worker refreshes a given entry at a time
+    if not await redis_client.set(f"{key}:refresh", 1, nx=True, ex=30):
+        return
+    try:
+        generations = await _generations(key, travel_date)
+        async with AsyncSessionLocal() as db:
+            await _store(key, travel_date, await loader(db), generations)
+    except Exception as e:
+        print(f"Search Cache Error: {e}")
+    finally:
+        await redis_client.delete(f"{key}:refresh")
+
+async def get_or_load(
+    db: AsyncSession,
+    source: str,
+    destination: str,
+    travel_date: date,
+    loader: Callable[[AsyncSession], Awaitable[list]]
+) -> Tuple[list, str]:
+    """
+    Returns (results, etag) for the normalized tuple from Redis, falling
+    back to `loader(db)` on a miss. Entries past their TTL are still served
+    while a background task reloads them (stale-while-revalidate).
+    The ETag is a hash of the results, so it changes whenever they do.
+    """
+    key = cache_key(source, destination, travel_date)
+    raw = await redis_client.get(key)
+    if raw is not None:
+        entry = json.loads(raw)
+        if entry["fresh_until"] > time.time():
+            _count("hits")
+        else:
+            _count("stale_hits")
+            _spawn(_revalidate(key, travel_date, loader))
+        etag = entry.get("etag") or _etag(json.dumps(entry["results"], separators=(",", ":")))
+        return entry["results"], etag
+
+    _count("misses")
+    generations = await _generations(key, travel_date)
+    results = await loader(db)
+    return results, await _store(key, travel_date, results, generations)
+
+async def invalidate_trip(source: str, destination: str, departure_date: date):
+    """Drops the cached search that lists a trip whose availability just changed."""
+    key = cache_key(source, destination, departure_date)
+    # Bumping the generation first also voids a load of this key in flight
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.incr(generation_key(key))
+        pipe.expire(generation_key(key), GENERATION_TTL)
+        pipe.unlink(key)
+        await pipe.execute()
+
+async def invalidate_dates(dates: Iterable[date]):
+    """Drops every cached search for the given travel dates (e.g. after seeding)."""
+    for travel_date in set(dates):
+        index = date_index_key(travel_date)
+        # After the bump no load of this date can store, so the index is complete
+        async with redis_client.pipeline(transaction=True) as pipe:
+            pipe.incr(generation_key(index))
+            pipe.expire(generation_key(index), GENERATION_TTL)
+            await pipe.execute()
+        keys = await redis_client.smembers(index)
+        await redis_client.unlink(index, *keys)
+
+def invalidate_dates_sync(client, dates: Iterable[date]):
+    """`invalidate_dates` for worker processes, through a blocking Redis client."""
+    for travel_date in set(dates):
+        index = date_index_key(travel_date)
+        with client.pipeline(transaction=True) as pipe:
+            pipe.incr(generation_key(index))
+            pipe.expire(generation_key(index), GENERATION_TTL)
+            pipe.execute()
+        client.unlink(index, *client.smembers(index))
+
+async def stats() -> dict:
+    """Hit/miss counters across all workers, for sizing the cache."""
+    counters = {k: int(v) for k, v in (await redis_client.hgetall(STATS_KEY)).items()}
+    hits, stale, misses = counters.get("hits", 0), counters.get("stale_hits", 0), counters.get("misses", 0)
+    total = hits + stale + misses
+    return {
+        "hits": hits,
+        "stale_hits": stale,
+        "misses": misses,
+        "hit_ratio": round((hits + stale) / total, 3) if total else 0.0
+    }
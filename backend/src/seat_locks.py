@@ -0,0 +1,312 @@
+import os
+from typing import Dict, List, Tuple
+from .cache import redis_client
+
+# How long a seat hold survives without a booking (seconds)
+SEAT_HOLD_SECONDS = int(os.getenv("SEAT_HOLD_SECONDS", 300))
+# Maximum number of seats one user may hold on a single trip at once
+MAX_SEATS_PER_USER = int(os.getenv("MAX_SEATS_PER_USER", 6))
+# Extra lifetime of a trip's hold index beyond its newest hold
+HOLD_INDEX_GRACE_SECONDS = 60
+# Maximum number of due holds the sweeper expires per script call
+HOLD_SWEEP_BATCH = int(os.getenv("HOLD_SWEEP_BATCH", 200))
+# Minimum hold time left once a booking has claimed its seats, so the holds
+# cannot expire while the booking transaction commits (seconds)
+BOOKING_CLAIM_SECONDS = 30
+
+# Result codes returned by the lock script
+LOCK_OK = 0
+LOCK_CONFLICT = 1
+LOCK_LIMIT = 2
+
+# Holds for one trip live in two keys:
+#   holds:{trip_id}        hash  seat_number -> owner user id
+#   hold_expiry:{trip_id}  zset  seat_number scored by its deadline (epoch ms)
+# and every hold is also scheduled in one global sorted set:
+#   hold_deadlines         zset  'trip_id:seat_number' scored by its deadline
+# A hold counts only while its deadline is in the future, so a seat never looks
+# taken past its deadline even before the sweeper has published the release.
+HOLD_DEADLINES_KEY = "hold_deadlines"
+
+# Lease that elects the single process allowed to sweep expired holds
+SWEEPER_LEASE_KEY = "hold_sweeper:leader"
+
+# Every change to a trip's seats (hold, release, expiry, booking) bumps
+#   trip_version:{trip_id} integer, the basis of the trip's HTTP ETags
+# A counter that is missing (never set, or expired after TRIP_VERSION_SECONDS)
+# restarts from the current time in ms, so an ETag issued before can never
+# match again.
+TRIP_VERSION_SECONDS = 7 * 86400
+
+# Current Redis server time in milliseconds, shared by all scripts
+_NOW_MS_LUA = """
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) * 1000 + math.floor(tonumber(clock[2]) / 1000)
+"""
+
+# Defines bump_version(key); needs `now` from _NOW_MS_LUA
+_BUMP_VERSION_LUA = """
+local function bump_version(key)
+    redis.call('SET', key, now, 'NX')
+    redis.call('INCR', key)
+    redis.call('EXPIRE', key, %d)
+end
+""" % TRIP_VERSION_SECONDS
+
+# All-or-nothing multi-seat lock. Runs atomically inside Redis, so two users
+# can never both "win" the same seat between the ownership check and the write.
+# KEYS[1] holds hash, KEYS[2] trip expiry zset, KEYS[3] global deadline zset,
+# KEYS[4] trip version
+# ARGV[1] user id, ARGV[2] ttl, ARGV[3] hold cap, ARGV[4] index grace,
+# ARGV[5] trip id, ARGV[6..] seat numbers
+LOCK_SEATS_LUA = _NOW_MS_LUA + _BUMP_VERSION_LUA + """
+local user, ttl, cap, grace, trip = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[3]), tonumber(ARGV[4]), ARGV[5]
+
+local function live_owner(seat)
+    local deadline = redis.call('ZSCORE', KEYS[2], seat)
+    if deadline and tonumber(deadline) > now then
+        return redis.call('HGET', KEYS[1], seat)
+    end
+    return false
+end
+
+-- 1. Reject the whole batch if any seat is held by someone else
+local conflicts, wanted = {}, {}
+for i = 6, #ARGV do
+    local owner = live_owner(ARGV[i])
+    if owner and owner ~= user then
+        table.insert(conflicts, ARGV[i])
+    end
+    wanted[ARGV[i]] = true
+end
+if #conflicts > 0 then
+    return {1, conflicts}
+end
+
+-- 2. Enforce the per-user cap across existing and requested seats
+local held, total = 0, #ARGV - 5
+local entries = redis.call('HGETALL', KEYS[1])
+for i = 1, #entries, 2 do
+    if entries[i + 1] == user and live_owner(entries[i]) == user then
+        held = held + 1
+        if not wanted[entries[i]] then
+            total = total + 1
+        end
+    end
+end
+if total > cap then
+    return {2, {held}}
+end
+
+-- 3. Take (or refresh) every hold and schedule its expiry
+local deadline = now + ttl * 1000
+for i = 6, #ARGV do
+    redis.call('HSET', KEYS[1], ARGV[i], user)
+    redis.call('ZADD', KEYS[2], deadline, ARGV[i])
+    redis.call('ZADD', KEYS[3], deadline, trip .. ':' .. ARGV[i])
+end
+-- The index outlives its newest hold so the sweeper always finds it
+redis.call('EXPIRE', KEYS[1], ttl + grace)
+redis.call('EXPIRE', KEYS[2], ttl + grace)
+bump_version(KEYS[4])
+return {0, {}}
+"""
+
+# Releases only the seats the caller actually holds and returns their numbers.
+# KEYS[1] holds hash, KEYS[2] trip expiry zset, KEYS[3] global deadline zset,
+# KEYS[4] trip version
+# ARGV[1] user id, ARGV[2] trip id, ARGV[3..] seat numbers
+UNLOCK_SEATS_LUA = _NOW_MS_LUA + _BUMP_VERSION_LUA + """
+local released = {}
+for i = 3, #ARGV do
+    if redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[1] then
+        redis.call('HDEL', KEYS[1], ARGV[i])
+        redis.call('ZREM', KEYS[2], ARGV[i])
+        redis.call('ZREM', KEYS[3], ARGV[2] .. ':' .. ARGV[i])
+        table.insert(released, ARGV[i])
+    end
+end
+if #released > 0 then
+    bump_version(KEYS[4])
+end
+return released
+"""
+
+# Verifies that the caller holds every seat it is about to book and, only if
+# so, keeps those holds alive for at least ARGV[2] more seconds. Returns the
+# seats the caller does not (or no longer) hold; empty means claimed.
+# KEYS[1] holds hash, KEYS[2] trip expiry zset, KEYS[3] global deadline zset
+# ARGV[1] user id, ARGV[2] claim seconds, ARGV[3] trip id, ARGV[4..] seat numbers
+CLAIM_SEATS_LUA = _NOW_MS_LUA + """
+local missing = {}
+for i = 4, #ARGV do
+    local deadline = redis.call('ZSCORE', KEYS[2], ARGV[i])
+    if not (deadline and tonumber(deadline) > now and redis.call('HGET', KEYS[1], ARGV[i]) == ARGV[1]) then
+        table.insert(missing, ARGV[i])
+    end
+end
+if #missing > 0 then
+    return missing
+end
+local floor = now + tonumber(ARGV[2]) * 1000
+for i = 4, #ARGV do
+    if tonumber(redis.call('ZSCORE', KEYS[2], ARGV[i])) < floor then
+        redis.call('ZADD', KEYS[2], floor, ARGV[i])
+        redis.call('ZADD', KEYS[3], floor, ARGV[3] .. ':' .. ARGV[i])
+    end
+end
+return {}
+"""
+
+# Pops up to ARGV[1] due entries from the global schedule, drops the matching
+# holds from their trip index and returns them as a flat [trip, seat, ...] list.
+# Trip keys are derived inside the script, so this assumes a single Redis node.
+# KEYS[1] global deadline zset
+SWEEP_LUA = _NOW_MS_LUA + _BUMP_VERSION_LUA + """
+local due = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, tonumber(ARGV[1]))
+local expired = {}
+for _, member in ipairs(due) do
+    redis.call('ZREM', KEYS[1], member)
+    local trip, seat = string.match(member, '^(%d+):(%d+)$')
+    local expiry_key = 'hold_expiry:' .. trip
+    local deadline = redis.call('ZSCORE', expiry_key, seat)
+    -- Skip holds that were re-locked with a later deadline in the meantime
+    if deadline and tonumber(deadline) <= now then
+        redis.call('HDEL', 'holds:' .. trip, seat)
+        redis.call('ZREM', expiry_key, seat)
+        bump_version('trip_version:' .. trip)
+        table.insert(expired, trip)
+        table.insert(expired, seat)
+    end
+end
+return expired
+"""
+
+# Takes or renews the sweeper lease; returns 1 while this process holds it.
+# KEYS[1] lease key; ARGV[1] process token, ARGV[2] lease ttl (ms)
+SWEEPER_LEASE_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    redis.call('PEXPIRE', KEYS[1], ARGV[2])
+    return 1
+end
+if redis.call('SET', KEYS[1], ARGV[1], 'NX', 'PX', ARGV[2]) then
+    return 1
+end
+return 0
+"""
+
+# Snapshot of the live holds on one trip as a flat [seat, owner, ...] list.
+# KEYS[1] holds hash, KEYS[2] trip expiry zset
+SNAPSHOT_LUA = _NOW_MS_LUA + """
+local live = redis.call('ZRANGEBYSCORE', KEYS[2], '(' .. now, '+inf')
+if #live == 0 then
+    return {}
+end
+local owners = redis.call('HMGET', KEYS[1], unpack(live))
+local out = {}
+for i = 1, #live do
+    if owners[i] then
+        table.insert(out, live[i])
+        table.insert(out, owners[i])
+    end
+end
+return out
+"""
+
+_lock_script = redis_client.register_script(LOCK_SEATS_LUA)
+_unlock_script = redis_client.register_script(UNLOCK_SEATS_LUA)
+_claim_script = redis_client.register_script(CLAIM_SEATS_LUA)
+_sweep_script = redis_client.register_script(SWEEP_LUA)
+_lease_script = redis_client.register_script(SWEEPER_LEASE_LUA)
+# Reads a trip's version, starting a missing counter from the current time.
+# KEYS[1] trip version
+TRIP_VERSION_LUA = _NOW_MS_LUA + """
+redis.call('SET', KEYS[1], now, 'NX', 'EX', %d)
+return redis.call('GET', KEYS[1])
+""" % TRIP_VERSION_SECONDS
+
+# Bumps a trip's version after a change made outside the scripts above.
+# KEYS[1] trip version
+BUMP_VERSION_LUA = _NOW_MS_LUA + _BUMP_VERSION_LUA + """
+bump_version(KEYS[1])
+"""
+
+_snapshot_script = redis_client.register_script(SNAPSHOT_LUA)
+_version_script = redis_client.register_script(TRIP_VERSION_LUA)
+_bump_script = redis_client.register_script(BUMP_VERSION_LUA)
+
+def holds_key(trip_id: int) -> str:
+    """Redis hash mapping seat number to the owner of the hold."""
+    return f"holds:{trip_id}"
+
+def hold_expiry_key(trip_id: int) -> str:
+    """Redis sorted set of held seat numbers scored by hold deadline."""
+    return f"hold_expiry:{trip_id}"
+
+def trip_version_key(trip_id: int) -> str:
+    """Redis counter bumped on every change to the trip's seats."""
+    return f"trip_version:{trip_id}"
+
+def _trip_keys(trip_id: int) -> List[str]:
+    return [holds_key(trip_id), hold_expiry_key(trip_id), HOLD_DEADLINES_KEY, trip_version_key(trip_id)]
+
+async def lock_seats(trip_id: int, seat_numbers: List[int], user_id: int) -> Tuple[int, List[int]]:
+    """
+    Atomically holds all requested seats for the user, or none of them.
+    Returns (LOCK_OK, []), (LOCK_CONFLICT, conflicting seats) or
+    (LOCK_LIMIT, [number of seats already held]).
+    """
+    args = [user_id, SEAT_HOLD_SECONDS, MAX_SEATS_PER_USER, HOLD_INDEX_GRACE_SECONDS, trip_id] + list(seat_numbers)
+    code, payload = await _lock_script(keys=_trip_keys(trip_id), args=args)
+    return int(code), [int(x) for x in payload]
+
+async def unlock_seats(trip_id: int, seat_numbers: List[int], user_id: int) -> List[int]:
+    """Releases the given seats if (and only if) the user holds them."""
+    released = await _unlock_script(keys=_trip_keys(trip_id), args=[user_id, trip_id] + list(seat_numbers))
+    return [int(x) for x in released]
+
+async def claim_seats(trip_id: int, seat_numbers: List[int], user_id: int) -> List[int]:
+    """
+    Atomically checks that the user holds all the seats before they are
+    booked, and keeps the holds from expiring mid-commit.
+    Returns the seats the user does not hold (empty when all are claimed).
+    """
+    args = [user_id, BOOKING_CLAIM_SECONDS, trip_id] + list(seat_numbers)
+    missing = await _claim_script(keys=_trip_keys(trip_id)[:3], args=args)
+    return [int(x) for x in missing]
+
+async def release_seats(trip_id: int, seat_numbers: List[int]):
+    """
+    Drops the holds on seats that have just been booked and bumps the trip's
+    version, in one round trip.
+    """
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.hdel(holds_key(trip_id), *seat_numbers)
+        pipe.zrem(hold_expiry_key(trip_id), *seat_numbers)
+        pipe.zrem(HOLD_DEADLINES_KEY, *[f"{trip_id}:{n}" for n in seat_numbers])
+        await _bump_script(keys=[trip_version_key(trip_id)], client=pipe)
+        await pipe.execute()
+
+async def sweep_expired(batch: int = HOLD_SWEEP_BATCH) -> Dict[int, List[int]]:
+    """
+    Expires up to `batch` holds whose deadline has passed.
+    Returns the released seat numbers grouped by trip id.
+    """
+    flat = await _sweep_script(keys=[HOLD_DEADLINES_KEY], args=[batch])
+    expired: Dict[int, List[int]] = {}
+    for i in range(0, len(flat), 2):
+        expired.setdefault(int(flat[i]), []).append(int(flat[i + 1]))
+    return expired
+
+async def acquire_sweeper_lease(token: str, ttl_ms: int) -> bool:
+    """Takes or renews the sweeper lease for this process."""
+    return bool(await _lease_script(keys=[SWEEPER_LEASE_KEY], args=[token, ttl_ms]))
+
+async def locked_seats(trip_id: int) -> List[Tuple[int, int]]:
+    """Returns (seat_number, owner_id) for every live hold on the trip."""
+    flat = await _snapshot_script(keys=[holds_key(trip_id), hold_expiry_key(trip_id)])
+    return [(int(flat[i]), int(flat[i + 1])) for i in range(0, len(flat), 2)]
+
+async def trip_version(trip_id: int) -> int:
+    """Current version of the trip's seats, for ETags."""
+    return int(await _version_script(keys=[trip_version_key(trip_id)]))
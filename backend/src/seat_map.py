@@ -0,0 +1,81 @@
+import os
+from typing import Iterable, List, Optional
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from . import models
+from .cache import redis_client
+
+# Booked seats of a trip are one bitmap: seat n is bit (n - 1) of
+# `Trip.booked_seats`. The column is a signed BIGINT, so a bus can have at
+# most 63 seats.
+MAX_SEATS = 63
+
+# Lifetime of the Redis mirror of a trip's bitmap (seconds)
+SEAT_MAP_CACHE_SECONDS = int(os.getenv("SEAT_MAP_CACHE_SECONDS", 86400))
+
+# The Redis mirror is a string bitmap where bit offset n is seat n, so a
+# booking only ever sets bits (BITFIELD ... SET u1 n 1) and concurrent
+# writers commute. Offset 0 has no seat and marks the mirror as loaded from
+# the database; without it the bitmap may be partial and is rebuilt.
+_LOADED_BIT = 0
+
+def seat_mask(seat_numbers: Iterable[int]) -> int:
+    """Bitmap with the bits of the given seats set."""
+    mask = 0
+    for n in seat_numbers:
+        mask |= 1 << (int(n) - 1)
+    return mask
+
+def decode(mask: int, total_seats: int = MAX_SEATS) -> List[int]:
+    """Seat numbers whose bit is set in the bitmap."""
+    return [n for n in range(1, total_seats + 1) if mask >> (n - 1) & 1]
+
+def seat_map_key(trip_id: int) -> str:
+    """Redis bitmap mirroring `Trip.booked_seats`."""
+    return f"seatmap:{trip_id}"
+
+async def mirror_booked(trip_id: int, seat_numbers: Iterable[int], loaded: bool = False):
+    """Sets the bits of newly booked seats in the Redis mirror."""
+    field = redis_client.bitfield(seat_map_key(trip_id))
+    if loaded:
+        field.set("u1", _LOADED_BIT, 1)
+    for n in seat_numbers:
+        field.set("u1", int(n), 1)
+    await field.execute()
+    if loaded:
+        await redis_client.expire(seat_map_key(trip_id), SEAT_MAP_CACHE_SECONDS)
+
+async def _mirrored_seats(trip_id: int) -> Optional[List[int]]:
+    # Read offsets 0..63 as one signed 64-bit word; offset 0 is the top bit
+    (word,) = await redis_client.bitfield(seat_map_key(trip_id)).get("i64", 0).execute()
+    word &= (1 << 64) - 1
+    if not word >> (63 - _LOADED_BIT) & 1:
+        return None
+    return [n for n in range(1, MAX_SEATS + 1) if word >> (63 - n) & 1]
+
+async def trip_exists(db: AsyncSession, trip_id: int) -> bool:
+    """
+    Whether the trip exists. A loaded Redis mirror answers without SQL;
+    otherwise the trip row is read and the mirror loaded from it.
+    """
+    if await _mirrored_seats(trip_id) is not None:
+        return True
+    mask = await db.scalar(select(models.Trip.booked_seats).where(models.Trip.id == trip_id))
+    if mask is None:
+        return False
+    await mirror_booked(trip_id, decode(mask), loaded=True)
+    return True
+
+async def booked_seats(db: AsyncSession, trip_id: int) -> List[int]:
+    """
+    Booked seat numbers of a trip, from the Redis mirror when it is loaded,
+    otherwise from the trip row (which then reloads the mirror).
+    """
+    mirrored = await _mirrored_seats(trip_id)
+    if mirrored is not None:
+        return mirrored
+    mask = await db.scalar(select(models.Trip.booked_seats).where(models.Trip.id == trip_id))
+    seats = decode(mask or 0)
+    if mask is not None:
+        await mirror_booked(trip_id, seats, loaded=True)
+    return seats
@@ -1,97 +1,209 @@
-import pandas as pd
-import random
-import string
-import os
-from datetime import datetime, timedelta
-from sqlalchemy import func
-from sqlalchemy.orm import Session
-from . import models
-
-def generate_tn_number():
-    """
-    Generates a random Tamil Nadu (TN) registration number format.
-    Example output: 'TN 39 A 1234'
-    """
-    letter = random.choice(string.ascii_uppercase)
-    digits = "".join(random.choices(string.digits, k=4))
-    return f"TN 39 {letter} {digits}"
-
-def seed_data(file_path: str, db: Session):
-    """
-    Parses an Excel file to populate the database with Bus, Trip, and Seat data.
-    Automatically calculates upcoming dates to ensure the schedule is current.
-    """
-    # Load the Excel file into a DataFrame
-    df = pd.read_excel(file_path)
-    
-    # Clean hidden spaces from column headers for reliable access
-    df.columns = df.columns.str.strip()
-    
-    # Map weekday strings to integer indexes (Monday=0, Sunday=6)
-    day_map = {
-        "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3, 
-        "Friday": 4, "Saturday": 5, "Sunday": 6
-    }
-
-    # --- Dynamic Date Logic ---
-    # Retrieve the latest trip departure date existing in the database
-    latest_trip_dt = db.query(func.max(models.Trip.departure_time)).scalar()
-    
-    if latest_trip_dt:
-        # If trips exist, start seeding from the following Monday
-        start_date = latest_trip_dt.date() + timedelta(days=(7 - latest_trip_dt.weekday()))
-    else:
-        # If DB is empty, start seeding from the beginning of the current week
-        today = datetime.now().date()
-        start_date = today - timedelta(days=today.weekday())
-
-    for _, row in df.iterrows():
-        day_str = str(row['Day']).strip()
-        if day_str not in day_map:
-            continue
-
-        # 1. Bus Management: Fetch existing bus or create a new entry
-        bus = db.query(models.Bus).filter(models.Bus.bus_name == row['Bus Name']).first()
-        if not bus:
-            bus = models.Bus(
-                bus_name=row['Bus Name'],
-                bus_number=generate_tn_number(),
-                bus_type=row['Bus Type'],
-                total_seats=40
-            )
-            db.add(bus)
-            db.flush() # Flush to get the bus.id for the Trip relation
-
-        # 2. DateTime Calculation
-        # Determine the specific date for the trip based on the week start
-        target_date = start_date + timedelta(days=day_map[day_str])
-        dep_time = datetime.strptime(str(row['Departure Time']).strip(), "%I:%M %p").time()
-        arr_time = datetime.strptime(str(row['Arrival Time']).strip(), "%I:%M %p").time()
-        
-        dep_dt = datetime.combine(target_date, dep_time)
-        arr_dt = datetime.combine(target_date, arr_time)
-        
-        # If arrival time is numerically lower than departure, assume next-day arrival
-        if arr_dt <= dep_dt:
-            arr_dt += timedelta(days=1)
-
-        # 3. Create Trip Entry
-        trip = models.Trip(
-            bus_id=bus.id,
-            source=row['Source'],
-            destination=row['Destination'],
-            departure_time=dep_dt,
-            arrival_time=arr_dt,
-            price=row['Fare (INR)']
-        )
-        db.add(trip)
-        db.flush() # Flush to get trip.id for seat association
-
-        # 4. Generate Initial Seat Map
-        # Create 40 individual Seat entries for this specific trip
-        seats = [models.Seat(trip_id=trip.id, seat_number=n) for n in range(1, 41)]
-        db.add_all(seats)
-
-    # Finalize all transactions to the database
-    db.commit()
-    return True
\ No newline at end of file
+import pandas as pd
+import random
+import string
+import os
+from datetime import datetime, timedelta
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import Session
+from typing import Callable, Optional
+from . import models, rollups
+from .database import dialect_insert
+
+# Trips written (and committed) per transaction when seeding
+SEED_CHUNK_SIZE = int(os.getenv("SEED_CHUNK_SIZE", 1000))
+
+def generate_tn_number():
+    """
+    Generates a random Tamil Nadu (TN) registration number format.
+    Example output: 'TN 39 A 1234'
+    """
+    letter = random.choice(string.ascii_uppercase)
+    digits = "".join(random.choices(string.digits, k=4))
+    return f"TN 39 {letter} {digits}"
+
+def unused_tn_numbers(db: Session, count: int) -> list:
+    """
+    `count` registration numbers that no bus uses yet, so a bulk insert of
+    new buses never trips the unique constraint on `bus_number`.
+    """
+    taken = set(db.scalars(select(models.Bus.bus_number)))
+    numbers = []
+    while len(numbers) < count:
+        number = generate_tn_number()
+        if number not in taken:
+            taken.add(number)
+            numbers.append(number)
+    return numbers
+
+# Map weekday strings to integer indexes (Monday=0, Sunday=6)
+DAY_INDEX = {
+    "Monday": 0, "Tuesday": 1, "Wednesday": 2, "Thursday": 3,
+    "Friday": 4, "Saturday": 5, "Sunday": 6
+}
+
+def seed_start_date(db: Session):
+    """
+    Monday of the first week to schedule: the week after the latest trip in
+    the database, or the current week when there are no trips yet.
+    """
+    latest_trip_dt = db.query(func.max(models.Trip.departure_time)).scalar()
+    if latest_trip_dt:
+        return latest_trip_dt.date() + timedelta(days=(7 - latest_trip_dt.weekday()))
+    today = datetime.now().date()
+    return today - timedelta(days=today.weekday())
+
+def _clock_offsets(times: pd.Series) -> pd.Series:
+    # "09:30 PM" -> 21h30m past midnight, parsed for the whole column at once
+    parsed = pd.to_datetime(times.astype(str).str.strip(), format="%I:%M %p")
+    return parsed - parsed.dt.normalize()
+
+def schedule_frame(df: pd.DataFrame, start_date) -> pd.DataFrame:
+    """
+    Turns the weekly schedule sheet into one row per trip of the week that
+    starts on `start_date`, with absolute departure and arrival datetimes.
+    Rows naming an unknown weekday are dropped.
+    """
+    # Clean hidden spaces from column headers for reliable access
+    df = df.rename(columns=str.strip)
+    day_index = df["Day"].astype(str).str.strip().map(DAY_INDEX)
+    df = df[day_index.notna()]
+    day_index = day_index[day_index.notna()]
+
+    trip_dates = pd.Timestamp(start_date) + pd.to_timedelta(day_index, unit="D")
+    departure = trip_dates + _clock_offsets(df["Departure Time"])
+    arrival = trip_dates + _clock_offsets(df["Arrival Time"])
+    # If arrival time is numerically lower than departure, assume next-day arrival
+    arrival = arrival.where(arrival > departure, arrival + pd.Timedelta(days=1))
+
+    return pd.DataFrame({
+        "bus_name": df["Bus Name"],
+        "bus_type": df["Bus Type"],
+        "source": df["Source"],
+        "destination": df["Destination"],
+        "departure_time": departure,
+        "arrival_time": arrival,
+        "price": df["Fare (INR)"],
+    })
+
+def _bus_ids(db: Session, trips: pd.DataFrame) -> dict:
+    """
+    Bus name -> (id, total_seats) for every bus the schedule names, creating
+    the missing ones with one multi-row INSERT ... RETURNING.
+    """
+    names = trips["bus_name"].unique().tolist()
+    buses = {
+        name: (bus_id, total_seats)
+        for name, bus_id, total_seats in db.execute(
+            select(models.Bus.bus_name, models.Bus.id, models.Bus.total_seats)
+            .where(models.Bus.bus_name.in_(names))
+        )
+    }
+    # A new bus takes the type of its first row in the sheet
+    new_buses = trips[~trips["bus_name"].isin(list(buses))].drop_duplicates("bus_name")
+    if len(new_buses):
+        created = db.execute(
+            insert(models.Bus).returning(models.Bus.bus_name, models.Bus.id, models.Bus.total_seats),
+            [
+                {"bus_name": name, "bus_number": number, "bus_type": bus_type, "total_seats": 40}
+                for name, bus_type, number in zip(
+                    new_buses["bus_name"].tolist(), new_buses["bus_type"].tolist(),
+                    unused_tn_numbers(db, len(new_buses))
+                )
+            ]
+        )
+        buses.update({name: (bus_id, total_seats) for name, bus_id, total_seats in created})
+    return buses
+
+def _week_starts(db: Session, weeks: Optional[int]) -> list:
+    if weeks is None:
+        return [seed_start_date(db)]
+    # A horizon always counts from the current week, so re-running it is idempotent
+    today = datetime.now().date()
+    this_monday = today - timedelta(days=today.weekday())
+    return [this_monday + timedelta(weeks=k) for k in range(weeks)]
+
+def seed_frame(
+    df: pd.DataFrame,
+    db: Session,
+    weeks: Optional[int] = None,
+    on_progress: Optional[Callable[[int, int, int, list], None]] = None
+):
+    """
+    Schedules trips from a schedule sheet already loaded into a DataFrame:
+    dates and times are parsed per column, buses are resolved with one
+    query, and trips go out as executemany INSERTs of SEED_CHUNK_SIZE rows,
+    each chunk committed on its own.
+
+    Without `weeks`, one week is scheduled after the latest trip in the
+    database. With `weeks`, the current week and the following ones up to
+    that horizon are scheduled, skipping departures already in the past.
+    Trips are upserted on (bus_id, departure_time), so a trip that already
+    exists is left untouched and re-running a seed never duplicates one.
+
+    `on_progress(processed, total, created, dates)` is called once before
+    the first chunk and after every commit, `dates` being the departure
+    dates that chunk added trips to.
+    Returns the departure dates that received new trips.
+    """
+    trips = pd.concat(
+        [schedule_frame(df, start) for start in _week_starts(db, weeks)], ignore_index=True
+    )
+    if weeks is not None:
+        trips = trips[trips["departure_time"] > pd.Timestamp(datetime.now())]
+    if trips.empty:
+        return []
+
+    buses = _bus_ids(db, trips)
+    # New buses are committed first; every trip chunk below depends on them
+    db.commit()
+    trips["bus_id"] = trips["bus_name"].map(lambda name: buses[name][0])
+    trips["total_seats"] = trips["bus_name"].map(lambda name: buses[name][1])
+
+    rows = [
+        {
+            "bus_id": bus_id, "source": source, "destination": destination,
+            "departure_time": dep, "arrival_time": arr, "price": price,
+            # Every seat starts free: an empty booked-seat bitmap
+            "available_seats": total_seats, "booked_seats": 0,
+        }
+        for bus_id, source, destination, dep, arr, price, total_seats in zip(
+            trips["bus_id"].tolist(), trips["source"].tolist(), trips["destination"].tolist(),
+            trips["departure_time"].dt.to_pydatetime().tolist(), trips["arrival_time"].dt.to_pydatetime().tolist(),
+            trips["price"].tolist(), trips["total_seats"].tolist()
+        )
+    ]
+
+    Trip = models.Trip
+    # Only rows that were actually inserted come back from RETURNING
+    upsert = (
+        dialect_insert(db.bind.dialect.name)(Trip)
+        .on_conflict_do_nothing(index_elements=["bus_id", "departure_time"])
+        .returning(Trip.bus_id, Trip.source, Trip.destination, Trip.departure_time, Trip.available_seats)
+    )
+    seeded_dates = set()
+    created = 0
+    if on_progress:
+        on_progress(0, len(rows), 0, [])
+    for i in range(0, len(rows), SEED_CHUNK_SIZE):
+        inserted = db.execute(upsert, rows[i:i + SEED_CHUNK_SIZE]).all()
+        if inserted:
+            # The new departures add their seats to the dashboard's occupancy figures
+            db.execute(rollups.increment_stmt(db.bind.dialect.name), rollups.merge_deltas(
+                rollups.trip_deltas(trip, trip.available_seats) for trip in inserted
+            ))
+        db.commit()
+
+        chunk_dates = sorted({trip.departure_time.date() for trip in inserted})
+        seeded_dates.update(chunk_dates)
+        created += len(inserted)
+        if on_progress:
+            on_progress(min(i + SEED_CHUNK_SIZE, len(rows)), len(rows), created, chunk_dates)
+    return sorted(seeded_dates)
+
+def seed_data(file_path: str, db: Session, weeks: Optional[int] = None):
+    """
+    Parses an Excel file to populate the database with Bus and Trip data.
+    Automatically calculates upcoming dates to ensure the schedule is current.
+    Returns the departure dates that received new trips.
+    """
+    return seed_frame(pd.read_excel(file_path), db, weeks)
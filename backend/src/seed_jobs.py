@@ -0,0 +1,98 @@
+import io
+import os
+import time
+import logging
+import uuid
+from typing import Optional
+import pandas as pd
+from .cache import redis_client, sync_redis_client
+from .database import SessionLocal
+from . import search_cache, seed
+
+# Largest schedule upload accepted (bytes)
+MAX_SEED_UPLOAD_BYTES = int(os.getenv("MAX_SEED_UPLOAD_BYTES", 10 * 1024 * 1024))
+# Longest "weeks ahead" horizon a seed job may generate
+MAX_SEED_WEEKS = int(os.getenv("MAX_SEED_WEEKS", 52))
+# How long a job's status (and its not yet consumed upload) is kept (seconds)
+SEED_JOB_TTL = int(os.getenv("SEED_JOB_TTL", 86400))
+
+logger = logging.getLogger(__name__)
+
+def job_key(job_id: str) -> str:
+    # Hash with the job's state and progress counters
+    return f"seed_job:{job_id}"
+
+def upload_key(job_id: str) -> str:
+    # The uploaded sheet, held until the worker picks it up
+    return f"seed_job:{job_id}:upload"
+
+async def create_job(filename: str, content: bytes, weeks: Optional[int]) -> str:
+    """
+    Parks the upload in Redis and records a queued job. The worker reads the
+    sheet straight from memory, so nothing is written to the API's disk.
+    """
+    job_id = uuid.uuid4().hex
+    async with redis_client.pipeline(transaction=True) as pipe:
+        pipe.set(upload_key(job_id), content, ex=SEED_JOB_TTL)
+        pipe.hset(job_key(job_id), mapping={
+            "state": "queued",
+            "filename": filename,
+            "weeks": weeks or "",
+            "total": 0,
+            "processed": 0,
+            "created": 0,
+            "queued_at": int(time.time()),
+        })
+        pipe.expire(job_key(job_id), SEED_JOB_TTL)
+        await pipe.execute()
+    return job_id
+
+async def get_job(job_id: str) -> Optional[dict]:
+    job = await redis_client.hgetall(job_key(job_id))
+    if not job:
+        return None
+    for field in ("total", "processed", "created", "queued_at", "started_at", "finished_at"):
+        if field in job:
+            job[field] = int(job[field])
+    job["weeks"] = int(job["weeks"]) if job.get("weeks") else None
+    job["job_id"] = job_id
+    return job
+
+def run_job(job_id: str) -> dict:
+    """
+    Worker side of a seed job: parses the parked sheet and seeds it in
+    committed chunks, publishing progress to the job hash after each one.
+    Searches cached for the dates that gained trips are dropped as it goes.
+    """
+    key = job_key(job_id)
+    weeks = sync_redis_client.hget(key, "weeks")
+    weeks = int(weeks) if weeks else None
+    content = sync_redis_client.getdel(upload_key(job_id))
+    if content is None:
+        sync_redis_client.hset(key, mapping={"state": "failed", "error": "Upload expired or already processed"})
+        return {"state": "failed"}
+
+    sync_redis_client.hset(key, mapping={"state": "running", "started_at": int(time.time())})
+    db = SessionLocal()
+    try:
+        df = pd.read_excel(io.BytesIO(content))
+
+        def on_progress(processed: int, total: int, created: int, dates: list):
+            sync_redis_client.hset(key, mapping={"processed": processed, "total": total, "created": created})
+            if dates:
+                search_cache.invalidate_dates_sync(sync_redis_client, dates)
+
+        seeded_dates = seed.seed_frame(df, db, weeks, on_progress)
+        sync_redis_client.hset(key, mapping={"state": "done", "finished_at": int(time.time())})
+        return {"state": "done", "dates": [d.isoformat() for d in seeded_dates]}
+    except Exception:
+        db.rollback()
+        # The details go to the worker log; the job hash is read over the API
+        logger.exception("Seed job %s failed", job_id)
+        # Chunks committed before the failure stay; with a `weeks` horizon,
+        # uploading the sheet again fills in only the missing trips
+        error = "Seeding failed; check that the sheet has the expected columns and values"
+        sync_redis_client.hset(key, mapping={"state": "failed", "error": error, "finished_at": int(time.time())})
+        return {"state": "failed", "error": error}
+    finally:
+        db.close()